@@ -20,6 +20,8 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["checkout"])
 
+ORDERS_PAGE_SIZE = 20
+
 
 @router.get("/checkout", response_class=HTMLResponse)
 async def checkout_page(request: Request):
@@ -269,6 +271,7 @@ async def order_details(
 async def my_orders(
     request: Request,
     status: Optional[str] = None,
+    page: int = 1,
     db: Client = Depends(get_db)
 ):
     """Display user's order history with optional status filter."""
@@ -277,11 +280,17 @@ async def my_orders(
     if not user:
         return RedirectResponse(url="/auth/login?next=/orders", status_code=303)
     
+    page = max(page, 1)
     order_service = OrderService(db)
     orders = await order_service.list_customer_orders(
         customer_id=user['id'],
-        status_filter=status
+        status_filter=status,
+        page=page,
+        page_size=ORDERS_PAGE_SIZE,
+        include_items=True  # my_orders.html previews item names
     )
+    has_next = len(orders) > ORDERS_PAGE_SIZE
+    orders = orders[:ORDERS_PAGE_SIZE]
     
     templates = request.app.state.templates
     
@@ -289,7 +298,9 @@ async def my_orders(
         "request": request,
         "title": "Pesanan Saya",
         "orders": orders,
-        "active_filter": status  # Pass active filter to template
+        "active_filter": status,  # Pass active filter to template
+        "page": page,
+        "has_next": has_next
     }
     
     return templates.TemplateResponse("my_orders.html", context)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
 from app.services.products import ProductError, ProductService, product_service
@@ -92,10 +92,14 @@ def create_product(
 
 
 @router.get("/", response_model=List[ProductResponse])
-def list_products(service: ProductService = Depends(get_product_service)) -> List[ProductResponse]:
-    """List all products."""
-    products = service.list_products()
-    return [ProductResponse(**_serialize_product(p)) for p in products]
+def list_products(
+    limit: int = Query(default=50, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    service: ProductService = Depends(get_product_service),
+) -> List[ProductResponse]:
+    """List products one page at a time."""
+    rows = service.list_product_rows(limit=limit, offset=offset)
+    return [ProductResponse(**row) for row in rows]
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
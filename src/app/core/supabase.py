@@ -14,6 +14,13 @@ else:
         Client = Any  # type: ignore
         create_client = None  # type: ignore
 
+try:
+    import httpx
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    httpx = None  # type: ignore[assignment]
+    orjson = None  # type: ignore[assignment]
+
 from app.core.config import get_settings
 
 
@@ -21,6 +28,48 @@ class SupabaseError(Exception):
     """Raised when Supabase operations fail."""
 
 
+if httpx is not None and orjson is not None:
+
+    class OrjsonHttpxClient(httpx.Client):
+        """httpx client that encodes and decodes PostgREST JSON bodies with orjson."""
+
+        def build_request(self, method, url, *, json=None, **kwargs):  # type: ignore[override]
+            if json is not None:
+                headers = httpx.Headers(kwargs.pop("headers", None))
+                headers["Content-Type"] = "application/json"
+                kwargs["headers"] = headers
+                kwargs["content"] = orjson.dumps(json)
+            return super().build_request(method, url, **kwargs)
+
+        def send(self, request, **kwargs):  # type: ignore[override]
+            response = super().send(request, **kwargs)
+            response.json = lambda **_: orjson.loads(response.content)  # type: ignore[method-assign]
+            return response
+
+else:  # pragma: no cover - optional speedup
+    OrjsonHttpxClient = None  # type: ignore[assignment,misc]
+
+
+def _client_options() -> Any:
+    """Return Supabase client options wiring in the orjson transport if available."""
+
+    if OrjsonHttpxClient is None:
+        return None
+    try:
+        from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+        from supabase import ClientOptions
+
+        # A caller-supplied client replaces the one supabase-py would build, so
+        # carry over its timeout and redirect handling.
+        httpx_client = OrjsonHttpxClient(
+            timeout=DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+            follow_redirects=True,
+        )
+        return ClientOptions(httpx_client=httpx_client)
+    except (ImportError, TypeError):  # pragma: no cover - older supabase-py
+        return None
+
+
 @lru_cache
 def get_supabase_client() -> Client | None:
     """Return a configured Supabase client or None if unavailable."""
@@ -33,9 +82,16 @@ def get_supabase_client() -> Client | None:
     if not settings.supabase_url or not settings.supabase_service_role_key:
         return None
     
+    options = _client_options()
+    if options is None:
+        return create_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key
+        )
     return create_client(
         settings.supabase_url,
-        settings.supabase_service_role_key
+        settings.supabase_service_role_key,
+        options=options,
     )
 
 
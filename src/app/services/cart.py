@@ -3,6 +3,7 @@
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 import json
+import math
 
 
 @dataclass
@@ -97,7 +98,8 @@ class CartService:
 
         items = self._get_cart_items(session)
 
-        subtotal = sum(
+        # fsum keeps float prices from accumulating rounding error
+        subtotal = math.fsum(
             item['unit_price'] * item['quantity']
             for item in items
         )
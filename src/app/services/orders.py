@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, UTC
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
+from operator import itemgetter, mul
 
 try:
     from supabase import Client
@@ -15,6 +16,16 @@ from app.services.settlement import SettlementService
 
 logger = logging.getLogger(__name__)
 
+_unit_price = itemgetter('unit_price')
+_quantity = itemgetter('quantity')
+
+
+def _to_cents(amount: Any) -> int:
+    """Convert a rupiah amount (``numeric(12,2)`` on the DB side) to integer cents."""
+    if isinstance(amount, int):
+        return amount * 100
+    return round(float(amount) * 100)
+
 
 class OrderError(Exception):
     """Base exception for order operations."""
@@ -54,34 +65,33 @@ class OrderService:
             logger.error("Order creation attempted without database connection")
             raise OrderError("Database connection required for order operations")
 
-        # Generate order number
-        order_number = self._generate_order_number()
-        logger.info(f"Creating order {order_number} for customer {customer_id} with {len(items)} items")
+        logger.info(f"Creating order for customer {customer_id} with {len(items)} items")
 
         # Validate stock
         try:
             await self._validate_stock(items)
         except InsufficientStock as e:
-            logger.warning(f"Order creation failed for {order_number}: {str(e)}")
+            logger.warning(f"Order creation failed for customer {customer_id}: {str(e)}")
             raise
 
-        # Calculate totals
-        subtotal = sum(
-            Decimal(str(item['unit_price'])) * item['quantity']
-            for item in items
-        )
+        # Calculate totals in integer cents; convert once at the end
+        subtotal_cents = sum(map(
+            mul,
+            map(_to_cents, map(_unit_price, items)),
+            map(int, map(_quantity, items)),
+        ))
+        subtotal = subtotal_cents / 100
 
-        # Create order
+        # Create order; order_number is minted by the database (migration 0010)
         order_data = {
-            'order_number': order_number,
             'customer_id': customer_id,
             'channel': channel,
             'status': 'draft',
             'payment_status': 'pending',
-            'subtotal_amount': float(subtotal),
+            'subtotal_amount': subtotal,
             'shipping_amount': 0,  # Will be calculated with RajaOngkir
             'discount_amount': 0,
-            'total_amount': float(subtotal),
+            'total_amount': subtotal,
             'metadata': {'payment_method': payment_method}
         }
 
@@ -92,6 +102,7 @@ class OrderService:
 
         order = order_result.data[0]
         order_id = order['id']
+        order_number = order['order_number']
 
         # Create order items
         order_items = []
@@ -161,23 +172,24 @@ class OrderService:
 
         # Update order
         update_data = {'status': new_status}
+        now_iso = datetime.now(UTC).isoformat()
 
         # Set timestamps based on status
         if new_status == 'paid':
-            update_data['paid_at'] = datetime.now(UTC).isoformat()
+            update_data['paid_at'] = now_iso
             update_data['payment_status'] = 'paid'
         elif new_status == 'shipped':
-            update_data['fulfilled_at'] = datetime.now(UTC).isoformat()
+            update_data['fulfilled_at'] = now_iso
             if tracking_number:
                 metadata = {'tracking_number': tracking_number}
                 update_data['metadata'] = metadata
         elif new_status == 'completed':
-            update_data['completed_at'] = datetime.now(UTC).isoformat()
+            update_data['completed_at'] = now_iso
             
             # Auto-release wallet funds to seller with platform fee
             await self._release_wallet_payment(order_id)
         elif new_status == 'cancelled':
-            update_data['cancelled_at'] = datetime.now(UTC).isoformat()
+            update_data['cancelled_at'] = now_iso
             update_data['cancellation_reason'] = note
 
         self.db.table('orders').update(update_data).eq('id', order_id).execute()
@@ -211,21 +223,33 @@ class OrderService:
     async def list_customer_orders(
         self,
         customer_id: str,
-        status_filter: Optional[str] = None
+        status_filter: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20,
+        include_items: bool = False
     ) -> List[Dict[str, Any]]:
-        """List all orders for a customer."""
+        """List one page of orders for a customer, newest first.
+
+        Up to ``page_size + 1`` rows are returned; the extra row only signals
+        that another page follows and is not part of this page. Line items are
+        only embedded when ``include_items`` is set, and then only the columns
+        needed for an order summary.
+        """
         if not self.db:
             raise OrderError("Database connection required")
 
+        columns = '*, order_items(product_name, quantity)' if include_items else '*'
+        offset = (max(page, 1) - 1) * page_size
+
         query = self.db.table('orders') \
-            .select('*, order_items(count)') \
+            .select(columns) \
             .eq('customer_id', customer_id) \
             .order('created_at', desc=True)
 
         if status_filter:
             query = query.eq('status', status_filter)
 
-        result = query.execute()
+        result = query.range(offset, offset + page_size).execute()
         return result.data
 
     async def update_order_metadata(self, order_id: str, metadata: Dict[str, Any]) -> None:
@@ -266,33 +290,39 @@ class OrderService:
 
     # Private helpers
 
-    def _generate_order_number(self) -> str:
-        """Generate unique order number."""
-        import secrets
-
-        date_part = datetime.now().strftime('%Y%m%d')
-        random_part = secrets.token_hex(4).upper()
-        return f"ORD-{date_part}-{random_part}"
-
     async def _validate_stock(self, items: List[Dict]) -> None:
-        """Validate that all items have sufficient stock."""
+        """Validate that all items have sufficient stock.
+
+        Quantities are summed per product first so repeated lines for one
+        product are checked against its stock together, and all listings are
+        fetched in a single query.
+        """
         if not self.db:
             return
 
+        required: Dict[str, int] = {}
+        names: Dict[str, str] = {}
         for item in items:
-            listing = self.db.table('marketplace_listings') \
-                .select('stock_on_hand, stock_reserved') \
-                .eq('product_id', item['product_id']) \
-                .execute()
+            product_id = item['product_id']
+            required[product_id] = required.get(product_id, 0) + item['quantity']
+            names.setdefault(product_id, item['product_name'])
+
+        listings = self.db.table('marketplace_listings') \
+            .select('product_id, stock_on_hand, stock_reserved') \
+            .in_('product_id', list(required)) \
+            .execute()
+        stock = {row['product_id']: row for row in listings.data}
 
-            if not listing.data:
-                raise OrderError(f"Produk {item['product_name']} tidak tersedia")
+        for product_id, quantity in required.items():
+            listing = stock.get(product_id)
+            if listing is None:
+                raise OrderError(f"Produk {names[product_id]} tidak tersedia")
 
-            available = listing.data[0]['stock_on_hand'] - listing.data[0]['stock_reserved']
-            if available < item['quantity']:
+            available = listing['stock_on_hand'] - listing['stock_reserved']
+            if available < quantity:
                 raise InsufficientStock(
-                    f"Stok {item['product_name']} tidak mencukupi. "
-                    f"Tersedia: {available}, diminta: {item['quantity']}"
+                    f"Stok {names[product_id]} tidak mencukupi. "
+                    f"Tersedia: {available}, diminta: {quantity}"
                 )
 
     async def _reserve_inventory(self, order_id: str, items: List[Dict]) -> None:
@@ -5,8 +5,10 @@ from __future__ import annotations
 import secrets
 import re
 import logging
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from itertools import islice
 from typing import Dict, Iterable, Optional, List, Any
 
 try:
@@ -16,6 +18,25 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASH = re.compile(r'[-\s]+')
+
+# Columns consumed by _map_product that exist on products (migration 0001);
+# avoids pulling every product column per row. The sambatan slot/deadline
+# fields have no column yet and are left to _map_product's .get() defaults.
+_PRODUCT_COLUMNS = 'id, name, price_low, created_at, updated_at, sambatan_enabled'
+_SEARCH_COLUMNS = 'id, name, slug, description, price_low, created_at'
+# Wire-format listing columns, renamed by PostgREST to the API field names.
+_PRODUCT_ROW_COLUMNS = (
+    'id, name, base_price:price_low, is_sambatan_enabled:sambatan_enabled, '
+    'created_at, updated_at'
+)
+
+_fromiso = datetime.fromisoformat
+
+# How long a mapped Supabase product row may be served from the local cache.
+_PRODUCT_CACHE_TTL_SECONDS = 30.0
+
 
 class ProductError(Exception):
     """Base error class for product operations."""
@@ -39,7 +60,7 @@ def _ensure_utc(dt: datetime) -> datetime:
     return dt.astimezone(UTC)
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Represents an item listed in the marketplace catalog."""
 
@@ -78,25 +99,29 @@ class ProductService:
     def __init__(self, db: Optional[Client] = None) -> None:
         self.db = db
         self._products: Dict[str, Product] = {}  # Fallback for in-memory mode
+        self._search_names: Dict[str, str] = {}  # product_id -> casefolded name
+        self._cache: Dict[str, tuple[float, Product]] = {}  # Supabase read cache
 
     def _slugify(self, text: str) -> str:
         """Generate URL-friendly slug from text."""
-        text = text.lower().strip()
-        text = re.sub(r'[^\w\s-]', '', text)
-        text = re.sub(r'[-\s]+', '-', text)
-        return text
+        return _SLUG_DASH.sub('-', _SLUG_STRIP.sub('', text.lower().strip()))
 
     def _map_product(self, data: Dict[str, Any]) -> Product:
-        """Map Supabase row to Product dataclass."""
+        """Map Supabase row to Product dataclass.
+
+        PostgREST always serialises timestamps as ISO strings, so they are
+        parsed directly without type checks.
+        """
+        deadline = data.get('sambatan_deadline')
         return Product(
             id=data['id'],
             name=data['name'],
             base_price=int(data.get('price_low', 0)),
-            created_at=datetime.fromisoformat(data['created_at']) if isinstance(data['created_at'], str) else data['created_at'],
-            updated_at=datetime.fromisoformat(data['updated_at']) if isinstance(data['updated_at'], str) else data['updated_at'],
+            created_at=_fromiso(data['created_at']),
+            updated_at=_fromiso(data['updated_at']),
             is_sambatan_enabled=data.get('sambatan_enabled', False),
             sambatan_total_slots=data.get('sambatan_total_slots'),
-            sambatan_deadline=datetime.fromisoformat(data['sambatan_deadline']) if data.get('sambatan_deadline') and isinstance(data['sambatan_deadline'], str) else data.get('sambatan_deadline'),
+            sambatan_deadline=_fromiso(deadline) if deadline else None,
         )
 
     def create_product(
@@ -143,6 +168,7 @@ class ProductService:
                 updated_at=now,
             )
             self._products[product_id] = product
+            self._search_names[product_id] = product.name.casefold()
             return product
 
     def toggle_sambatan(
@@ -154,6 +180,9 @@ class ProductService:
         deadline: Optional[datetime] = None,
     ) -> Product:
         product = self.get_product(product_id)
+        # The product below is mutated before the write lands; evict it first
+        # so a failed update cannot leave the edited copy cached.
+        self._cache.pop(product_id, None)
 
         if enabled:
             if total_slots is None or deadline is None:
@@ -164,7 +193,7 @@ class ProductService:
                 # Update in Supabase
                 update_data = {
                     'sambatan_enabled': True,
-                    'updated_at': datetime.now(UTC).isoformat()
+                    'updated_at': product.updated_at.isoformat()
                 }
                 self.db.table('products').update(update_data).eq('id', product_id).execute()
         else:
@@ -174,7 +203,7 @@ class ProductService:
                 # Update in Supabase
                 update_data = {
                     'sambatan_enabled': False,
-                    'updated_at': datetime.now(UTC).isoformat()
+                    'updated_at': product.updated_at.isoformat()
                 }
                 self.db.table('products').update(update_data).eq('id', product_id).execute()
 
@@ -183,10 +212,16 @@ class ProductService:
     def get_product(self, product_id: str) -> Product:
         if self.db:
             # Use Supabase
+            cached = self._cache.get(product_id)
+            if cached and time.monotonic() - cached[0] < _PRODUCT_CACHE_TTL_SECONDS:
+                return cached[1]
+
             result = self.db.table('products').select('*').eq('id', product_id).execute()
             if not result.data:
                 raise ProductNotFound("Produk tidak ditemukan.")
-            return self._map_product(result.data[0])
+            product = self._map_product(result.data[0])
+            self._cache[product_id] = (time.monotonic(), product)
+            return product
         else:
             # Fallback to in-memory
             try:
@@ -194,14 +229,48 @@ class ProductService:
             except KeyError as exc:
                 raise ProductNotFound("Produk tidak ditemukan.") from exc
 
-    def list_products(self) -> Iterable[Product]:
+    def list_products(self, *, limit: int = 100, offset: int = 0) -> Iterable[Product]:
         if self.db:
             # Use Supabase
-            result = self.db.table('products').select('*').order('created_at', desc=True).execute()
-            return [self._map_product(row) for row in result.data]
+            result = (
+                self.db.table('products')
+                .select(_PRODUCT_COLUMNS)
+                .order('created_at', desc=True)
+                .range(offset, offset + limit - 1)
+                .execute()
+            )
+            return list(map(self._map_product, result.data))
         else:
             # Fallback to in-memory
-            return self._products.values()
+            return list(islice(self._products.values(), offset, offset + limit))
+
+    def list_product_rows(self, *, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """List products as wire-format dicts without building Product objects.
+
+        Supabase rows are passed through untouched so timestamps are not parsed
+        only to be re-serialised by the API layer.
+        """
+        if self.db:
+            result = (
+                self.db.table('products')
+                .select(_PRODUCT_ROW_COLUMNS)
+                .order('created_at', desc=True)
+                .range(offset, offset + limit - 1)
+                .execute()
+            )
+            return result.data
+
+        return [
+            {
+                'id': p.id,
+                'name': p.name,
+                'base_price': p.base_price,
+                'is_sambatan_enabled': p.is_sambatan_enabled,
+                'created_at': p.created_at.isoformat(),
+                'updated_at': p.updated_at.isoformat(),
+            }
+            for p in self.list_products(limit=limit, offset=offset)
+        ]
 
     def search_products(
         self,
@@ -211,7 +280,13 @@ class ProductService:
     ) -> List[Dict[str, Any]]:
         """Search products with filters."""
         if not self.db:
-            # Fallback to listing all products
+            # Fallback: scan the flat name column, only touching matched products
+            if query:
+                needle = query.casefold()
+                ids = (pid for pid, name in self._search_names.items() if needle in name)
+            else:
+                ids = iter(self._search_names)
+            products = self._products
             return [
                 {
                     'id': p.id,
@@ -219,22 +294,25 @@ class ProductService:
                     'base_price': p.base_price,
                     'created_at': p.created_at.isoformat(),
                 }
-                for p in self._products.values()
+                for p in (products[pid] for pid in islice(ids, limit))
             ]
 
+        if query:
+            # Ranked trigram search (migration 0009); the query is bound as an
+            # RPC argument rather than spliced into a PostgREST filter string.
+            result = self.db.rpc('search_products', {
+                'p_query': query,
+                'p_limit': limit,
+                'p_marketplace_only': marketplace_only,
+            }).execute()
+            return result.data
+
         # Build Supabase query
-        db_query = self.db.table('products').select('*')
+        db_query = self.db.table('products').select(_SEARCH_COLUMNS)
 
         if marketplace_only:
             db_query = db_query.eq('marketplace_enabled', True)
 
-        if query:
-            # Simple text search
-            db_query = db_query.or_(
-                f"name.ilike.%{query}%,"
-                f"description.ilike.%{query}%"
-            )
-
         result = db_query.limit(limit).execute()
         return result.data
 
@@ -254,6 +332,7 @@ class ProductService:
             'is_active': True,
             'status': 'active'
         }).eq('id', product_id).execute()
+        self._cache.pop(product_id, None)
 
         # Create or update marketplace listing
         listing_data = {
@@ -2,14 +2,59 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Optional, Protocol
+import asyncio
+import importlib.util
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence
 
 try:  # pragma: no cover - optional dependency for the Supabase gateway
     import httpx
 except ModuleNotFoundError:  # pragma: no cover - environments without httpx
     httpx = None  # type: ignore[assignment]
 
+try:  # pragma: no cover - optional faster JSON decoding
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - environments without orjson
+    orjson = None  # type: ignore[assignment]
+
+
+# How long resolved profile rows are reused before refetching.
+_PROFILE_CACHE_TTL_SECONDS = 30.0
+
+_by_full_name = itemgetter("full_name")
+
+# PostgREST select projections and Prefer headers for SupabaseProfileGateway,
+# built once instead of per request. Auth headers live on the client itself.
+_PROFILE_SELECT = "id,username,full_name,bio,preferred_aroma,avatar_url,location,tagline"
+_PROFILE_STATS_SELECT = (
+    "profile_id,follower_count,following_count,perfumer_product_count,owned_brand_count"
+)
+_FOLLOW_PAIR_SELECT = "follower_id,following_id"
+_FOLLOWER_PROFILES_SELECT = "follower:user_profiles!follower_id(id,username,full_name,avatar_url)"
+_FOLLOWING_PROFILES_SELECT = "following:user_profiles!following_id(id,username,full_name,avatar_url)"
+_PERFUMER_PRODUCTS_SELECT = (
+    "product_id:id,role,"
+    "product:products(id,name,highlight,aroma_notes,"
+    "brand:brands(id,name,slug))"
+)
+_OWNED_BRANDS_SELECT = "brand_id:id,name,slug,logo_path,status,tagline"
+_PREFER_MINIMAL = {"Prefer": "return=minimal"}
+_PREFER_REPRESENTATION = {"Prefer": "return=representation"}
+# Duplicate follows hit the user_follows primary key and are ignored server-side.
+_PREFER_IGNORE_DUPLICATES = {"Prefer": "resolution=ignore-duplicates,return=minimal"}
+
+
+def _normalize_field(value: Any) -> Any:
+    """Trim string profile fields, treating blank strings as missing."""
+
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
 
 class ProfileError(Exception):
     """Base error class for profile operations."""
@@ -27,7 +72,7 @@ class ProfileNotFound(ProfileError):
     status_code = 404
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProfileUpdate:
     """Payload for profile mutation submitted from the edit form."""
 
@@ -38,14 +83,17 @@ class ProfileUpdate:
     location: Optional[str] = None
 
     def to_payload(self) -> Dict[str, Any]:
-        data = {
-            "full_name": self.full_name,
-            "bio": self.bio,
-            "preferred_aroma": self.preferred_aroma,
-            "avatar_url": self.avatar_url,
-            "location": self.location,
+        """Return the submitted fields with strings trimmed and blanks as None.
+
+        None values are kept so an emptied form field still clears the column.
+        """
+        return {
+            "full_name": _normalize_field(self.full_name),
+            "bio": _normalize_field(self.bio),
+            "preferred_aroma": _normalize_field(self.preferred_aroma),
+            "avatar_url": _normalize_field(self.avatar_url),
+            "location": _normalize_field(self.location),
         }
-        return data
 
 
 class ProfileGateway(Protocol):
@@ -84,8 +132,16 @@ class ProfileGateway(Protocol):
     async def update_profile(self, profile_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         ...
 
+    async def fetch_profile_bundle(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """Return profile, follow graph, products and brands in one call.
+
+        Optional: gateways without a bundled endpoint return ``None`` and the
+        service falls back to the individual fetches.
+        """
+        return None
 
-@dataclass
+
+@dataclass(slots=True)
 class ProfileBadge:
     """Represents a badge rendered on the profile header."""
 
@@ -96,7 +152,21 @@ class ProfileBadge:
     count: Optional[int] = None
 
 
-@dataclass
+_PERFUMER_BADGE = ProfileBadge(
+    slug="perfumer",
+    label="Perfumer",
+    description="Diracik pada produk marketplace Sensasiwangi.",
+    icon="🧪",
+)
+_BRAND_OWNER_BADGE = ProfileBadge(
+    slug="brand-owner",
+    label="Brand Owner",
+    description="Mengelola brand parfum independen di platform.",
+    icon="🏷️",
+)
+
+
+@dataclass(slots=True)
 class ProfileStats:
     """Aggregated counters displayed on the profile."""
 
@@ -106,7 +176,7 @@ class ProfileStats:
     owned_brand_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class PerfumerProduct:
     """Represents a product credited to a perfumer."""
 
@@ -118,7 +188,7 @@ class PerfumerProduct:
     highlight: str
 
 
-@dataclass
+@dataclass(slots=True)
 class OwnedBrand:
     """Represents a brand owned or administered by the profile."""
 
@@ -130,7 +200,7 @@ class OwnedBrand:
     tagline: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TimelineEntry:
     """Represents an activity entry shown on the profile."""
 
@@ -139,7 +209,7 @@ class TimelineEntry:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ProfileRecord:
     """Representation of a user profile loaded from Supabase."""
 
@@ -151,19 +221,20 @@ class ProfileRecord:
     avatar_url: Optional[str]
     location: Optional[str]
     tagline: Optional[str]
-    followers: set[str] = field(default_factory=set)
-    following: set[str] = field(default_factory=set)
+    followers: frozenset[str] = field(default_factory=frozenset)
+    following: frozenset[str] = field(default_factory=frozenset)
     perfumer_products: List[PerfumerProduct] = field(default_factory=list)
     owned_brands: List[OwnedBrand] = field(default_factory=list)
     activities: List[TimelineEntry] = field(default_factory=list)
     favorites: List[str] = field(default_factory=list)
     sambatan_updates: List[str] = field(default_factory=list)
 
-    def clone_relationships(self) -> tuple[set[str], set[str]]:
-        return set(self.followers), set(self.following)
+    def clone_relationships(self) -> tuple[frozenset[str], frozenset[str]]:
+        # followers/following are already frozensets, so they can be shared.
+        return self.followers, self.following
 
 
-@dataclass
+@dataclass(slots=True)
 class ProfileViewerState:
     """Viewer metadata that determines CTA state."""
 
@@ -176,13 +247,17 @@ class ProfileViewerState:
         return bool(self.id) and not self.is_owner
 
 
-@dataclass
+# Shared by every anonymous page view; views replace() it rather than mutate.
+_ANONYMOUS_VIEWER = ProfileViewerState(id=None, is_owner=False, is_following=False)
+
+
+@dataclass(slots=True)
 class ProfileView:
     """Bundle of data required to render a profile page."""
 
     profile: ProfileRecord
     stats: ProfileStats
-    badges: List[ProfileBadge]
+    badges: Sequence[ProfileBadge]
     viewer: ProfileViewerState
 
 
@@ -204,31 +279,85 @@ class SupabaseProfileGateway(ProfileGateway):
             )
 
         base = base_url.rstrip("/") + "/rest/v1"
-        self._client = httpx.AsyncClient(base_url=base, timeout=timeout)
         self._schema = schema
         self._headers = {
             "apikey": api_key,
             "Authorization": f"Bearer {api_key}",
             "Accept-Profile": schema,
         }
+        # get_profile fans out several requests at once; keep enough pooled
+        # connections for that and multiplex over HTTP/2 when h2 is installed.
+        self._client = httpx.AsyncClient(
+            base_url=base,
+            timeout=timeout,
+            headers=self._headers,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=20,
+                keepalive_expiry=30,
+            ),
+        )
+        self._inflight: Dict[str, asyncio.Future[Any]] = {}
+
+    async def _coalesce(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Share one in-flight request between concurrent identical lookups."""
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    @staticmethod
+    def _decode(response: Any) -> Any:
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
 
     async def _get(self, resource: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        response = await self._client.get(resource, params=params, headers=self._headers)
+        response = await self._client.get(resource, params=params)
         response.raise_for_status()
-        return response.json()
+        return self._decode(response)
 
     async def fetch_profile(self, identifier: str) -> Optional[Dict[str, Any]]:
+        return await self._coalesce(f"profile:{identifier}", lambda: self._fetch_profile(identifier))
+
+    async def _fetch_profile(self, identifier: str) -> Optional[Dict[str, Any]]:
+        # Profile ids are UUIDs; anything else is a username. Filtering on the
+        # matching column lets PostgREST use a plain indexed equality.
+        try:
+            uuid.UUID(identifier)
+        except ValueError:
+            column = "username"
+        else:
+            column = "id"
         params = {
-            "select": "id,username,full_name,bio,preferred_aroma,avatar_url,location,tagline",
-            "or": f"(username.eq.{identifier},id.eq.{identifier})",
+            "select": _PROFILE_SELECT,
+            column: f"eq.{identifier}",
             "limit": 1,
         }
         rows = await self._get("/user_profiles", params)
         return rows[0] if rows else None
 
+    async def fetch_profile_bundle(self, identifier: str) -> Optional[Dict[str, Any]]:
+        response = await self._client.post(
+            "/rpc/get_profile_bundle",
+            json={"p_identifier": identifier},
+        )
+        response.raise_for_status()
+        bundle = self._decode(response)
+        if not bundle or not bundle.get("profile"):
+            return None
+        return bundle
+
     async def fetch_profile_stats(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return await self._coalesce(f"stats:{profile_id}", lambda: self._fetch_profile_stats(profile_id))
+
+    async def _fetch_profile_stats(self, profile_id: str) -> Optional[Dict[str, Any]]:
         params = {
-            "select": "profile_id,follower_count,following_count,perfumer_product_count,owned_brand_count",
+            "select": _PROFILE_STATS_SELECT,
             "profile_id": f"eq.{profile_id}",
             "limit": 1,
         }
@@ -237,45 +366,44 @@ class SupabaseProfileGateway(ProfileGateway):
 
     async def fetch_follow_graph(self, profile_id: str) -> Dict[str, List[str]]:
         params = {
-            "select": "follower_id,following_id",
+            "select": _FOLLOW_PAIR_SELECT,
             "or": f"(follower_id.eq.{profile_id},following_id.eq.{profile_id})",
         }
         rows = await self._get("/user_follows", params)
-        followers = [row["follower_id"] for row in rows if row["following_id"] == profile_id]
-        following = [row["following_id"] for row in rows if row["follower_id"] == profile_id]
+        followers: List[str] = []
+        following: List[str] = []
+        add_follower = followers.append
+        add_following = following.append
+        for row in rows:
+            if row["following_id"] == profile_id:
+                add_follower(row["follower_id"])
+            if row["follower_id"] == profile_id:
+                add_following(row["following_id"])
         return {"followers": followers, "following": following}
 
     async def fetch_followers(self, profile_id: str) -> List[Dict[str, Any]]:
-        graph = await self.fetch_follow_graph(profile_id)
-        follower_ids = graph.get("followers", [])
-        if not follower_ids:
-            return []
         params = {
-            "select": "id,username,full_name,avatar_url",
-            "id": f"in.({','.join(follower_ids)})",
+            "select": _FOLLOWER_PROFILES_SELECT,
+            "following_id": f"eq.{profile_id}",
         }
-        rows = await self._get("/user_profiles", params)
-        return sorted(rows, key=lambda item: item.get("full_name", ""))
+        rows = await self._get("/user_follows", params)
+        profiles = [row["follower"] for row in rows if row.get("follower")]
+        profiles.sort(key=_by_full_name)  # full_name is NOT NULL in user_profiles
+        return profiles
 
     async def fetch_following(self, profile_id: str) -> List[Dict[str, Any]]:
-        graph = await self.fetch_follow_graph(profile_id)
-        following_ids = graph.get("following", [])
-        if not following_ids:
-            return []
         params = {
-            "select": "id,username,full_name,avatar_url",
-            "id": f"in.({','.join(following_ids)})",
+            "select": _FOLLOWING_PROFILES_SELECT,
+            "follower_id": f"eq.{profile_id}",
         }
-        rows = await self._get("/user_profiles", params)
-        return sorted(rows, key=lambda item: item.get("full_name", ""))
+        rows = await self._get("/user_follows", params)
+        profiles = [row["following"] for row in rows if row.get("following")]
+        profiles.sort(key=_by_full_name)  # full_name is NOT NULL in user_profiles
+        return profiles
 
     async def fetch_perfumer_products(self, profile_id: str) -> List[Dict[str, Any]]:
         params = {
-            "select": (
-                "product_id:id,role,"
-                "product:products(id,name,highlight,aroma_notes,"
-                "brand:brands(id,name,slug))"
-            ),
+            "select": _PERFUMER_PRODUCTS_SELECT,
             "perfumer_profile_id": f"eq.{profile_id}",
         }
         rows = await self._get("/product_perfumers", params)
@@ -297,7 +425,7 @@ class SupabaseProfileGateway(ProfileGateway):
 
     async def fetch_owned_brands(self, profile_id: str) -> List[Dict[str, Any]]:
         params = {
-            "select": "brand_id:id,name,slug,logo_path,status,tagline",
+            "select": _OWNED_BRANDS_SELECT,
             "profile_id": f"eq.{profile_id}",
         }
         rows = await self._get("/profile_brand_summary", params)
@@ -317,7 +445,7 @@ class SupabaseProfileGateway(ProfileGateway):
 
     async def check_following(self, *, follower_id: str, following_id: str) -> bool:
         params = {
-            "select": "follower_id,following_id",
+            "select": _FOLLOW_PAIR_SELECT,
             "follower_id": f"eq.{follower_id}",
             "following_id": f"eq.{following_id}",
             "limit": 1,
@@ -327,8 +455,9 @@ class SupabaseProfileGateway(ProfileGateway):
 
     async def create_follow(self, *, follower_id: str, following_id: str) -> None:
         payload = {"follower_id": follower_id, "following_id": following_id}
-        headers = {"Prefer": "return=minimal", **self._headers}
-        response = await self._client.post("/user_follows", json=payload, headers=headers)
+        response = await self._client.post(
+            "/user_follows", json=payload, headers=_PREFER_IGNORE_DUPLICATES
+        )
         if response.status_code not in (200, 201, 204):  # pragma: no cover - httpx raises elsewhere
             response.raise_for_status()
 
@@ -337,19 +466,19 @@ class SupabaseProfileGateway(ProfileGateway):
             "follower_id": f"eq.{follower_id}",
             "following_id": f"eq.{following_id}",
         }
-        headers = {"Prefer": "return=minimal", **self._headers}
-        response = await self._client.delete("/user_follows", params=params, headers=headers)
+        response = await self._client.delete(
+            "/user_follows", params=params, headers=_PREFER_MINIMAL
+        )
         if response.status_code not in (200, 204):  # pragma: no cover - httpx raises elsewhere
             response.raise_for_status()
 
     async def update_profile(self, profile_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        headers = {"Prefer": "return=representation", **self._headers}
         params = {"id": f"eq.{profile_id}"}
         response = await self._client.patch(
-            "/user_profiles", params=params, json=payload, headers=headers
+            "/user_profiles", params=params, json=payload, headers=_PREFER_REPRESENTATION
         )
         response.raise_for_status()
-        data = response.json()
+        data = self._decode(response)
         if isinstance(data, list):
             return data[0] if data else {}
         return data
@@ -359,28 +488,37 @@ class InMemoryProfileGateway(ProfileGateway):
     """In-memory implementation used for local development and tests."""
 
     def __init__(self) -> None:
+        # Profiles keyed by both id and username, pointing at the same dict.
         self._profiles: Dict[str, Dict[str, Any]] = {}
-        self._profiles_by_username: Dict[str, Dict[str, Any]] = {}
+        # Read-only views of the same dicts, created once per profile. The
+        # proxies are live, so they reflect update_profile without rebuilding.
+        self._views: Dict[str, Mapping[str, Any]] = {}
         self._followers: Dict[str, set[str]] = {}
         self._following: Dict[str, set[str]] = {}
-        self._perfumer_products: Dict[str, List[Dict[str, Any]]] = {}
-        self._owned_brands: Dict[str, List[Dict[str, Any]]] = {}
-        self._initial_relationships: Dict[str, tuple[set[str], set[str]]] = {}
-        self._seed_demo_profiles()
-
-    async def fetch_profile(self, identifier: str) -> Optional[Dict[str, Any]]:
-        if identifier in self._profiles:
-            return dict(self._profiles[identifier])
-        if identifier in self._profiles_by_username:
-            return dict(self._profiles_by_username[identifier])
-        return None
+        self._perfumer_products: Dict[str, tuple[Mapping[str, Any], ...]] = {}
+        self._owned_brands: Dict[str, tuple[Mapping[str, Any], ...]] = {}
+        self._initial_relationships: Dict[str, tuple[frozenset[str], frozenset[str]]] = {}
+        # Sorted follower/following lists, built lazily and dropped on writes.
+        self._sorted_followers: Dict[str, List[Mapping[str, Any]]] = {}
+        self._sorted_following: Dict[str, List[Mapping[str, Any]]] = {}
+        # Demo data is only built once the gateway is first used, so importing
+        # the module-level profile_service stays cheap.
+        self._seeded = False
+
+    # Reads hand out read-only views instead of defensive copies; the stored
+    # dicts are only mutated through update_profile.
+
+    async def fetch_profile(self, identifier: str) -> Optional[Mapping[str, Any]]:
+        self._ensure_seeded()
+        return self._views.get(identifier)
 
     async def fetch_profile_stats(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        self._ensure_seeded()
         follower_ids = self._followers.get(profile_id, set())
         following_ids = self._following.get(profile_id, set())
-        perfumer_products = self._perfumer_products.get(profile_id, [])
+        perfumer_products = self._perfumer_products.get(profile_id, ())
         owned_brands = [
-            brand for brand in self._owned_brands.get(profile_id, []) if brand.get("status") == "active"
+            brand for brand in self._owned_brands.get(profile_id, ()) if brand.get("status") == "active"
         ]
         return {
             "profile_id": profile_id,
@@ -391,57 +529,92 @@ class InMemoryProfileGateway(ProfileGateway):
         }
 
     async def fetch_follow_graph(self, profile_id: str) -> Dict[str, List[str]]:
+        self._ensure_seeded()
         followers = list(self._followers.get(profile_id, set()))
         following = list(self._following.get(profile_id, set()))
         return {"followers": followers, "following": following}
 
-    async def fetch_followers(self, profile_id: str) -> List[Dict[str, Any]]:
-        follower_ids = self._followers.get(profile_id, set())
-        profiles = [dict(self._profiles[follower_id]) for follower_id in follower_ids]
-        return sorted(profiles, key=lambda item: item.get("full_name", ""))
+    async def fetch_followers(self, profile_id: str) -> List[Mapping[str, Any]]:
+        self._ensure_seeded()
+        return list(self._sorted_profiles(self._sorted_followers, self._followers, profile_id))
 
-    async def fetch_following(self, profile_id: str) -> List[Dict[str, Any]]:
-        following_ids = self._following.get(profile_id, set())
-        profiles = [dict(self._profiles[following_id]) for following_id in following_ids]
-        return sorted(profiles, key=lambda item: item.get("full_name", ""))
+    async def fetch_following(self, profile_id: str) -> List[Mapping[str, Any]]:
+        self._ensure_seeded()
+        return list(self._sorted_profiles(self._sorted_following, self._following, profile_id))
 
-    async def fetch_perfumer_products(self, profile_id: str) -> List[Dict[str, Any]]:
-        return [dict(item) for item in self._perfumer_products.get(profile_id, [])]
+    def _sorted_profiles(
+        self,
+        cache: Dict[str, List[Mapping[str, Any]]],
+        graph: Dict[str, set[str]],
+        profile_id: str,
+    ) -> List[Mapping[str, Any]]:
+        profiles = cache.get(profile_id)
+        if profiles is None:
+            views = self._views
+            profiles = sorted(
+                (views[related_id] for related_id in graph.get(profile_id, ())),
+                key=_by_full_name,
+            )
+            cache[profile_id] = profiles
+        return profiles
 
-    async def fetch_owned_brands(self, profile_id: str) -> List[Dict[str, Any]]:
-        return [dict(item) for item in self._owned_brands.get(profile_id, [])]
+    async def fetch_perfumer_products(self, profile_id: str) -> Sequence[Mapping[str, Any]]:
+        self._ensure_seeded()
+        return self._perfumer_products.get(profile_id, ())
+
+    async def fetch_owned_brands(self, profile_id: str) -> Sequence[Mapping[str, Any]]:
+        self._ensure_seeded()
+        return self._owned_brands.get(profile_id, ())
 
     async def check_following(self, *, follower_id: str, following_id: str) -> bool:
+        self._ensure_seeded()
         return follower_id in self._followers.get(following_id, set())
 
     async def create_follow(self, *, follower_id: str, following_id: str) -> None:
+        self._ensure_seeded()
         self._followers.setdefault(following_id, set()).add(follower_id)
         self._following.setdefault(follower_id, set()).add(following_id)
+        self._sorted_followers.pop(following_id, None)
+        self._sorted_following.pop(follower_id, None)
 
     async def delete_follow(self, *, follower_id: str, following_id: str) -> None:
+        self._ensure_seeded()
         self._followers.setdefault(following_id, set()).discard(follower_id)
         self._following.setdefault(follower_id, set()).discard(following_id)
+        self._sorted_followers.pop(following_id, None)
+        self._sorted_following.pop(follower_id, None)
 
     async def update_profile(self, profile_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self._ensure_seeded()
         profile = self._profiles.get(profile_id)
         if not profile:
             raise ProfileNotFound("Profil tidak ditemukan.")
 
-        username = profile.get("username")
         profile.update(payload)
-        if username:
-            self._profiles_by_username[username] = profile
+        if "full_name" in payload:
+            # The profile may sit in any number of sorted lists.
+            self._sorted_followers.clear()
+            self._sorted_following.clear()
         return dict(profile)
 
     async def reset_relationships(self) -> None:
-        for profile_id, snapshot in self._initial_relationships.items():
-            followers, following = snapshot
+        self._ensure_seeded()
+        for profile_id, (followers, following) in self._initial_relationships.items():
             self._followers[profile_id] = set(followers)
             self._following[profile_id] = set(following)
+        self._sorted_followers.clear()
+        self._sorted_following.clear()
+
+    def _ensure_seeded(self) -> None:
+        if not self._seeded:
+            self._seeded = True
+            self._seed_demo_profiles()
 
     def _register_profile(self, profile: Dict[str, Any]) -> None:
-        self._profiles[profile["id"]] = profile
-        self._profiles_by_username[profile["username"]] = profile
+        view = MappingProxyType(profile)
+        for key in (profile["id"], profile["username"]):
+            self._profiles[key] = profile
+            self._views[key] = view
         self._followers.setdefault(profile["id"], set())
         self._following.setdefault(profile["id"], set())
 
@@ -582,6 +755,15 @@ class InMemoryProfileGateway(ProfileGateway):
             "user_chandra": [],
         }
 
+        self._perfumer_products = {
+            profile_id: tuple(MappingProxyType(item) for item in items)
+            for profile_id, items in self._perfumer_products.items()
+        }
+        self._owned_brands = {
+            profile_id: tuple(MappingProxyType(item) for item in items)
+            for profile_id, items in self._owned_brands.items()
+        }
+
         for profile in (amelia, bintang, chandra):
             self._register_profile(profile)
 
@@ -597,7 +779,7 @@ class InMemoryProfileGateway(ProfileGateway):
         }
 
         self._initial_relationships = {
-            profile_id: (set(followers), set(self._following.get(profile_id, set())))
+            profile_id: (frozenset(followers), frozenset(self._following.get(profile_id, ())))
             for profile_id, followers in self._followers.items()
         }
 
@@ -607,15 +789,31 @@ class ProfileService:
 
     def __init__(self, gateway: Optional[ProfileGateway] = None) -> None:
         self._gateway = gateway or InMemoryProfileGateway()
+        self._profile_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[tuple[str, str], asyncio.Lock] = {}
 
     async def get_profile(self, profile_identifier: str, *, viewer_id: Optional[str] = None) -> ProfileView:
-        profile_data = await self._resolve_profile_data(profile_identifier)
-        profile_id = profile_data["id"]
-
-        stats_data = await self._gateway.fetch_profile_stats(profile_id)
-        follow_graph = await self._gateway.fetch_follow_graph(profile_id)
-        perfumer_products = await self._gateway.fetch_perfumer_products(profile_id)
-        owned_brands = await self._gateway.fetch_owned_brands(profile_id)
+        # Structural gateways that only satisfy the Protocol may not define
+        # the optional bundle endpoint at all.
+        fetch_profile_bundle = getattr(self._gateway, "fetch_profile_bundle", None)
+        bundle = await fetch_profile_bundle(profile_identifier) if fetch_profile_bundle else None
+        if bundle:
+            profile_data = bundle["profile"]
+            follow_graph = {
+                "followers": bundle.get("followers") or [],
+                "following": bundle.get("following") or [],
+            }
+            perfumer_products = bundle.get("perfumer_products") or []
+            owned_brands = bundle.get("owned_brands") or []
+        else:
+            profile_data = await self._resolve_profile_data(profile_identifier)
+            profile_id = profile_data["id"]
+
+            follow_graph, perfumer_products, owned_brands = await asyncio.gather(
+                self._gateway.fetch_follow_graph(profile_id),
+                self._gateway.fetch_perfumer_products(profile_id),
+                self._gateway.fetch_owned_brands(profile_id),
+            )
 
         profile = self._build_profile_record(
             profile_data,
@@ -625,100 +823,79 @@ class ProfileService:
             owned_brands=owned_brands,
         )
 
-        stats = self._build_profile_stats(stats_data, profile)
-
-        viewer = ProfileViewerState(
-            id=viewer_id,
-            is_owner=viewer_id == profile.id if viewer_id else False,
-            is_following=(viewer_id in profile.followers) if viewer_id else False,
-        )
+        profile_id = profile.id
+        stats = self._build_profile_stats(profile)
+        badges = self._build_profile_badges(stats)
 
-        badges: List[ProfileBadge] = []
-        if profile.perfumer_products:
-            badges.append(
-                ProfileBadge(
-                    slug="perfumer",
-                    label="Perfumer",
-                    description="Diracik pada produk marketplace Sensasiwangi.",
-                    icon="🧪",
-                    count=len(profile.perfumer_products),
-                )
-            )
-        if any(brand for brand in profile.owned_brands if brand.status == "active"):
-            badges.append(
-                ProfileBadge(
-                    slug="brand-owner",
-                    label="Brand Owner",
-                    description="Mengelola brand parfum independen di platform.",
-                    icon="🏷️",
-                    count=len(profile.owned_brands),
-                )
+        if viewer_id:
+            viewer = ProfileViewerState(
+                id=viewer_id,
+                is_owner=viewer_id == profile_id,
+                is_following=viewer_id in profile.followers,
             )
+        else:
+            viewer = _ANONYMOUS_VIEWER
 
         return ProfileView(profile=profile, stats=stats, badges=badges, viewer=viewer)
 
     async def follow_profile(self, target_identifier: str, *, follower_id: str) -> ProfileView:
-        follower = await self._resolve_profile_data(follower_id)
-        target = await self._resolve_profile_data(target_identifier)
+        follower, target = await asyncio.gather(
+            self._resolve_profile_data(follower_id),
+            self._resolve_profile_data(target_identifier),
+        )
 
         if follower["id"] == target["id"]:
             raise ProfileError("Tidak dapat mengikuti profil sendiri.")
 
-        is_following = await self._gateway.check_following(
-            follower_id=follower["id"], following_id=target["id"]
+        # create_follow is idempotent, so no check_following round-trip first.
+        # The page read runs alongside the write and is patched afterwards.
+        view, _ = await asyncio.gather(
+            self.get_profile(target["id"], viewer_id=follower["id"]),
+            self._gateway.create_follow(follower_id=follower["id"], following_id=target["id"]),
         )
-        if not is_following:
-            await self._gateway.create_follow(follower_id=follower["id"], following_id=target["id"])
-
-        return await self.get_profile(target["id"], viewer_id=follower["id"])
+        return self._with_follow_state(view, follower["id"], is_following=True)
 
     async def unfollow_profile(self, target_identifier: str, *, follower_id: str) -> ProfileView:
-        follower = await self._resolve_profile_data(follower_id)
-        target = await self._resolve_profile_data(target_identifier)
+        follower, target = await asyncio.gather(
+            self._resolve_profile_data(follower_id),
+            self._resolve_profile_data(target_identifier),
+        )
 
         if follower["id"] == target["id"]:
             raise ProfileError("Tidak dapat berhenti mengikuti profil sendiri.")
 
-        is_following = await self._gateway.check_following(
-            follower_id=follower["id"], following_id=target["id"]
+        # Deleting a missing relationship is a no-op, so skip check_following.
+        view, _ = await asyncio.gather(
+            self.get_profile(target["id"], viewer_id=follower["id"]),
+            self._gateway.delete_follow(follower_id=follower["id"], following_id=target["id"]),
         )
-        if is_following:
-            await self._gateway.delete_follow(follower_id=follower["id"], following_id=target["id"])
-
-        return await self.get_profile(target["id"], viewer_id=follower["id"])
+        return self._with_follow_state(view, follower["id"], is_following=False)
 
     async def update_profile(
         self, profile_identifier: str, *, viewer_id: str, payload: ProfileUpdate
     ) -> tuple[ProfileView, bool]:
-        profile_data = await self._resolve_profile_data(profile_identifier)
         viewer_data = await self._resolve_profile_data(viewer_id)
+        # Diff against the stored row, not the TTL cache: a stale cached value
+        # would make a real change look like a no-op and skip the write.
+        profile_data = await self._gateway.fetch_profile(profile_identifier)
+        if not profile_data:
+            raise ProfileNotFound("Profil tidak ditemukan.")
 
         if profile_data["id"] != viewer_data["id"]:
             raise ProfileError("Tidak memiliki akses untuk memperbarui profil ini.")
 
-        update_payload = payload.to_payload()
-        if not update_payload:
-            profile_view = await self.get_profile(
-                profile_data["id"], viewer_id=viewer_data["id"]
-            )
-            return profile_view, False
-
-        def _normalize(value: Any) -> Any:
-            if value is None:
-                return None
-            if isinstance(value, str):
-                trimmed = value.strip()
-                return trimmed or None
-            return value
-
-        changes = {
-            key: value
-            for key, value in update_payload.items()
-            if _normalize(profile_data.get(key)) != _normalize(value)
-        }
+        # The payload side is already normalised by to_payload().
+        current = profile_data.get
+        changes: Dict[str, Any] = {}
+        for key, value in payload.to_payload().items():
+            old = current(key)
+            if old is value or _normalize_field(old) == value:
+                continue
+            changes[key] = value
 
         if changes:
             await self._gateway.update_profile(profile_data["id"], changes)
+            self._invalidate_profile(profile_data, profile_identifier)
 
         profile_view = await self.get_profile(
             profile_data["id"], viewer_id=viewer_data["id"]
@@ -738,12 +915,12 @@ class ProfileService:
     async def list_perfumer_products(self, profile_identifier: str) -> List[PerfumerProduct]:
         profile_data = await self._resolve_profile_data(profile_identifier)
         products = await self._gateway.fetch_perfumer_products(profile_data["id"])
-        return [self._build_perfumer_product(item) for item in products]
+        return list(map(self._build_perfumer_product, products))
 
     async def list_owned_brands(self, profile_identifier: str) -> List[OwnedBrand]:
         profile_data = await self._resolve_profile_data(profile_identifier)
         brands = await self._gateway.fetch_owned_brands(profile_data["id"])
-        return [self._build_owned_brand(item) for item in brands]
+        return list(map(self._build_owned_brand, brands))
 
     async def reset_relationships(self) -> None:
         reset = getattr(self._gateway, "reset_relationships", None)
@@ -753,12 +930,65 @@ class ProfileService:
         if hasattr(result, "__await__"):
             await result  # type: ignore[func-returns-value]
 
+    def _with_follow_state(
+        self, view: ProfileView, viewer_id: str, *, is_following: bool
+    ) -> ProfileView:
+        """Apply a follow/unfollow to a view read around the same write.
+
+        Set union/difference keeps this correct whether the read observed the
+        relationship before or after the write landed.
+        """
+        followers = view.profile.followers
+        followers = followers | {viewer_id} if is_following else followers - {viewer_id}
+        profile = replace(view.profile, followers=followers)
+        return replace(
+            view,
+            profile=profile,
+            stats=replace(view.stats, follower_count=len(followers)),
+            viewer=replace(view.viewer, is_following=is_following),
+        )
+
     async def _resolve_profile_data(self, identifier: str) -> Dict[str, Any]:
-        profile_data = await self._gateway.fetch_profile(identifier)
+        profile_data = await self._cached(
+            "profile", self._profile_cache, identifier, self._gateway.fetch_profile
+        )
         if not profile_data:
             raise ProfileNotFound("Profil tidak ditemukan.")
         return profile_data
 
+    async def _cached(
+        self,
+        namespace: str,
+        cache: Dict[str, tuple[float, Any]],
+        key: str,
+        loader: Callable[[str], Awaitable[Any]],
+    ) -> Any:
+        """Return a fresh cache entry or load it, coalescing concurrent misses."""
+
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[0] < _PROFILE_CACHE_TTL_SECONDS:
+            return entry[1]
+
+        lock_key = (namespace, key)
+        lock = self._inflight.setdefault(lock_key, asyncio.Lock())
+        try:
+            async with lock:
+                entry = cache.get(key)
+                if entry and time.monotonic() - entry[0] < _PROFILE_CACHE_TTL_SECONDS:
+                    return entry[1]
+                value = await loader(key)
+                if value is not None:
+                    cache[key] = (time.monotonic(), value)
+                return value
+        finally:
+            if not lock.locked():
+                self._inflight.pop(lock_key, None)
+
+    def _invalidate_profile(self, profile_data: Dict[str, Any], *identifiers: str) -> None:
+        for key in (profile_data.get("id"), profile_data.get("username"), *identifiers):
+            if key:
+                self._profile_cache.pop(key, None)
+
     def _build_profile_record(
         self,
         data: Dict[str, Any],
@@ -768,39 +998,46 @@ class ProfileService:
         perfumer_products: Iterable[Dict[str, Any]] | Iterable[PerfumerProduct] | None = None,
         owned_brands: Iterable[Dict[str, Any]] | Iterable[OwnedBrand] | None = None,
     ) -> ProfileRecord:
+        # Follower rows only carry a few columns, so keys stay optional; bind
+        # the lookup once rather than resolving data.get per field.
+        get = data.get
         return ProfileRecord(
-            id=data.get("id", ""),
-            username=data.get("username", ""),
-            full_name=data.get("full_name", ""),
-            bio=data.get("bio", ""),
-            preferred_aroma=data.get("preferred_aroma"),
-            avatar_url=data.get("avatar_url"),
-            location=data.get("location"),
-            tagline=data.get("tagline"),
-            followers=set(followers or []),
-            following=set(following or []),
-            perfumer_products=[self._build_perfumer_product(item) for item in perfumer_products or []],
-            owned_brands=[self._build_owned_brand(item) for item in owned_brands or []],
-            activities=[self._build_timeline_entry(item) for item in data.get("activities", [])],
-            favorites=list(data.get("favorites", [])),
-            sambatan_updates=list(data.get("sambatan_updates", [])),
+            id=get("id", ""),
+            username=get("username", ""),
+            full_name=get("full_name", ""),
+            bio=get("bio", ""),
+            preferred_aroma=get("preferred_aroma"),
+            avatar_url=get("avatar_url"),
+            location=get("location"),
+            tagline=get("tagline"),
+            followers=frozenset(followers or ()),
+            following=frozenset(following or ()),
+            perfumer_products=list(map(self._build_perfumer_product, perfumer_products or ())),
+            owned_brands=list(map(self._build_owned_brand, owned_brands or ())),
+            activities=list(map(self._build_timeline_entry, get("activities", ()))),
+            favorites=list(get("favorites", [])),
+            sambatan_updates=list(get("sambatan_updates", [])),
         )
 
-    def _build_profile_stats(self, stats: Optional[Dict[str, Any]], profile: ProfileRecord) -> ProfileStats:
-        if not stats:
-            return ProfileStats(
-                follower_count=len(profile.followers),
-                following_count=len(profile.following),
-                perfumer_product_count=len(profile.perfumer_products),
-                owned_brand_count=len(profile.owned_brands),
-            )
+    def _build_profile_stats(self, profile: ProfileRecord) -> ProfileStats:
+        # Derived from the lists already loaded for the page, so no separate
+        # stats round-trip is needed.
         return ProfileStats(
-            follower_count=stats.get("follower_count", len(profile.followers)),
-            following_count=stats.get("following_count", len(profile.following)),
-            perfumer_product_count=stats.get("perfumer_product_count", len(profile.perfumer_products)),
-            owned_brand_count=stats.get("owned_brand_count", len(profile.owned_brands)),
+            follower_count=len(profile.followers),
+            following_count=len(profile.following),
+            perfumer_product_count=len(profile.perfumer_products),
+            owned_brand_count=sum(1 for brand in profile.owned_brands if brand.status == "active"),
         )
 
+    def _build_profile_badges(self, stats: ProfileStats) -> tuple[ProfileBadge, ...]:
+        badges: List[ProfileBadge] = []
+        if stats.perfumer_product_count:
+            badges.append(replace(_PERFUMER_BADGE, count=stats.perfumer_product_count))
+        # owned_brand_count only counts active brands, computed once in stats.
+        if stats.owned_brand_count:
+            badges.append(replace(_BRAND_OWNER_BADGE, count=stats.owned_brand_count))
+        return tuple(badges)
+
     def _build_perfumer_product(self, data: Dict[str, Any] | PerfumerProduct) -> PerfumerProduct:
         if isinstance(data, PerfumerProduct):
             return data
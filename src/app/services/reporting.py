@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date
 from enum import Enum
+from functools import lru_cache
 from io import BytesIO, StringIO
-from typing import Iterable, List, Optional
-from zipfile import ZIP_DEFLATED, ZipFile
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
 import csv
 import logging
+import re
 from xml.sax.saxutils import escape
 
 try:
@@ -21,7 +25,7 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SalesRecord:
     """Represents a single sales record entry."""
 
@@ -34,6 +38,139 @@ class SalesRecord:
     status: str
 
 
+# Seed data format: (order_id, date, customer_id, customer_name, brand_name, items, amount, method, status)
+_FALLBACK_SEED = (
+    ("INV-2024-0401-01", "2024-04-01", "cust_001", "Anjani Parfums", "Langit Senja", 18, 6250000.0, "transfer", "settled"),
+    ("INV-2024-0401-02", "2024-04-01", "cust_002", "Mahesa Retail", "Studio Senja", 9, 2485000.0, "virtual_account", "settled"),
+    ("INV-2024-0402-01", "2024-04-02", "cust_003", "Studio Senja", "Atar Nusantara", 12, 3840000.0, "ewallet", "settled"),
+    ("INV-2024-0403-01", "2024-04-03", "cust_001", "Rara Widyanti", "Langit Senja", 7, 1890000.0, "transfer", "pending"),
+    ("INV-2024-0404-01", "2024-04-04", "cust_004", "Atar Nusantara", "Atar Nusantara", 14, 5125000.0, "transfer", "settled"),
+    ("INV-2024-0405-01", "2024-04-05", "cust_005", "Sukma Fragrances", "Studio Senja", 6, 1575000.0, "cash_on_delivery", "settled"),
+    ("INV-2024-0406-01", "2024-04-06", "cust_001", "Aura Lestari", "Langit Senja", 11, 3350000.0, "transfer", "settled"),
+)
+
+
+def _build_fallback_columns() -> tuple[tuple, ...]:
+    """Store the seed column by column, sorted by date with dates parsed up front."""
+    columns = list(zip(*sorted(_FALLBACK_SEED, key=itemgetter(1))))
+    columns[1] = tuple(map(date.fromisoformat, columns[1]))
+    return tuple(columns)
+
+
+# Built once at import: a new SalesReportService is created for every request.
+_FALLBACK_COLUMNS = _build_fallback_columns()
+# Sorted day ordinals of the seed dates, bisected for date-range lookups.
+_FALLBACK_ORDINALS = tuple(order_date.toordinal() for order_date in _FALLBACK_COLUMNS[1])
+
+
+def _index_column(column: Sequence[str]) -> Dict[str, tuple[int, ...]]:
+    """Map each value in a seed column to its ascending row indices."""
+    index: Dict[str, List[int]] = {}
+    for row, value in enumerate(column):
+        index.setdefault(value, []).append(row)
+    return {value: tuple(rows) for value, rows in index.items()}
+
+
+_FALLBACK_BY_CUSTOMER = _index_column(_FALLBACK_COLUMNS[2])
+_FALLBACK_BY_BRAND = _index_column(_FALLBACK_COLUMNS[4])
+
+# CSV header row in csv.writer's default dialect, and the characters that force
+# a field to be quoted.
+_CSV_HEADER = (
+    "Nomor Order,Tanggal Order,Nama Pelanggan,Jumlah Item,Total (Rp),"
+    "Metode Pembayaran,Status\r\n"
+)
+_CSV_SPECIAL = re.compile(r'[,"\r\n]')
+_format_csv_row = "{},{},{},{},{:.2f},{},{}\r\n".format
+# Pulls one export row out of a SalesRecord in a single C-level call.
+_ROW_GETTER = attrgetter(
+    "order_id",
+    "order_date",
+    "customer_name",
+    "total_items",
+    "total_amount",
+    "payment_method",
+    "status",
+)
+
+# Spreadsheet column names for the first 26 columns; wider sheets fall back to
+# the base-26 computation in _column_letter.
+_COLUMN_LETTERS = tuple("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+_XLSX_WORKBOOK_XML = (
+    "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+    "<workbook xmlns=\"http://schemas.openxmlformats.org/spreadsheetml/2006/main\" "
+    "xmlns:r=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships\">"
+    "<sheets><sheet name=\"Sales Report\" sheetId=\"1\" r:id=\"rId1\"/></sheets>"
+    "</workbook>"
+)
+
+_XLSX_WORKBOOK_RELS = (
+    "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+    "<Relationships xmlns=\"http://schemas.openxmlformats.org/package/2006/relationships\">"
+    "<Relationship Id=\"rId1\" Type=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet\" Target=\"worksheets/sheet1.xml\"/>"
+    "<Relationship Id=\"rId2\" Type=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles\" Target=\"styles.xml\"/>"
+    "</Relationships>"
+)
+
+_XLSX_STYLES_XML = (
+    "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+    "<styleSheet xmlns=\"http://schemas.openxmlformats.org/spreadsheetml/2006/main\">"
+    "<fonts count=\"1\"><font><sz val=\"11\"/><name val=\"Calibri\"/></font></fonts>"
+    "<fills count=\"1\"><fill><patternFill patternType=\"none\"/></fill></fills>"
+    "<borders count=\"1\"><border><left/><right/><top/><bottom/><diagonal/></border></borders>"
+    "<cellStyleXfs count=\"1\"><xf numFmtId=\"0\" fontId=\"0\" fillId=\"0\" borderId=\"0\"/></cellStyleXfs>"
+    "<cellXfs count=\"1\"><xf numFmtId=\"0\" fontId=\"0\" fillId=\"0\" borderId=\"0\" xfId=\"0\"/></cellXfs>"
+    "</styleSheet>"
+)
+
+_XLSX_RELS_XML = (
+    "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+    "<Relationships xmlns=\"http://schemas.openxmlformats.org/package/2006/relationships\">"
+    "<Relationship Id=\"rId1\" Type=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument\" Target=\"xl/workbook.xml\"/>"
+    "</Relationships>"
+)
+
+_XLSX_CONTENT_TYPES_XML = (
+    "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+    "<Types xmlns=\"http://schemas.openxmlformats.org/package/2006/content-types\">"
+    "<Default Extension=\"rels\" ContentType=\"application/vnd.openxmlformats-package.relationships+xml\"/>"
+    "<Default Extension=\"xml\" ContentType=\"application/xml\"/>"
+    "<Override PartName=\"/xl/workbook.xml\" ContentType=\"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml\"/>"
+    "<Override PartName=\"/xl/worksheets/sheet1.xml\" ContentType=\"application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml\"/>"
+    "<Override PartName=\"/xl/styles.xml\" ContentType=\"application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml\"/>"
+    "</Types>"
+)
+
+_XLSX_STATIC_PARTS = (
+    ("[Content_Types].xml", _XLSX_CONTENT_TYPES_XML),
+    ("_rels/.rels", _XLSX_RELS_XML),
+    ("xl/workbook.xml", _XLSX_WORKBOOK_XML),
+    ("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS),
+    ("xl/styles.xml", _XLSX_STYLES_XML),
+)
+
+
+# zlib level for the worksheet part. Level 1 is several times cheaper than the
+# default 6 for a modestly larger file.
+_XLSX_COMPRESSLEVEL = 1
+# Rows encoded and handed to the zip stream at a time when writing the sheet.
+_XLSX_ROW_CHUNK = 1000
+
+
+@lru_cache(maxsize=1)
+def _xlsx_template() -> bytes:
+    """Zip the static xlsx parts once; exports append their sheet to a copy.
+
+    The parts are small and never change, so they are stored uncompressed.
+    """
+    stream = BytesIO()
+    with ZipFile(stream, mode="w", compression=ZIP_STORED) as archive:
+        for name, content in _XLSX_STATIC_PARTS:
+            archive.writestr(name, content)
+    return stream.getvalue()
+
+
 class ExportFormat(str, Enum):
     """Supported export formats for sales reports."""
 
@@ -41,11 +178,17 @@ class ExportFormat(str, Enum):
     XLSX = "xlsx"
 
 
+# Orders fetched per Supabase request; also PostgREST's default max-rows cap.
+_SALES_REPORT_PAGE_SIZE = 1000
+
 class SalesReportService:
     """Service responsible for retrieving and exporting sales reports."""
 
-    def __init__(self, db: Optional[Client] = None) -> None:
+    def __init__(
+        self, db: Optional[Client] = None, *, xlsx_compresslevel: int = _XLSX_COMPRESSLEVEL
+    ) -> None:
         self.db = db
+        self.xlsx_compresslevel = xlsx_compresslevel
         logger.info(f"SalesReportService initialized with {'Supabase' if db else 'no database'}")
 
     def get_sales_report(
@@ -77,20 +220,59 @@ class SalesReportService:
             return self._get_fallback_report(start_date, end_date, customer_id, brand_id, status_filter)
         
         try:
-            # Query orders with items and brand info
-            query = self.db.table('orders').select(
-                '''
-                id,
-                order_number,
-                customer_id,
-                status,
-                payment_status,
-                total_amount,
-                created_at,
-                order_items(quantity, brand_name, product_id),
-                auth_accounts!orders_customer_id_fkey(full_name)
-                '''
+            records = list(
+                self.iter_sales_report(start_date, end_date, customer_id, brand_id, status_filter)
             )
+        except Exception as e:
+            logger.error(f"Error fetching sales report: {str(e)}", exc_info=True)
+            return []
+        
+        if not records:
+            logger.info(f"No orders found for date range {start_date} to {end_date}")
+            return []
+        
+        logger.info(f"Retrieved {len(records)} sales records for date range {start_date} to {end_date}")
+        return records
+    
+    def iter_sales_report(
+        self,
+        start_date: date,
+        end_date: date,
+        customer_id: Optional[str] = None,
+        brand_id: Optional[str] = None,
+        status_filter: Optional[str] = None,
+    ) -> Iterator[SalesRecord]:
+        """Yield sales records page by page instead of fetching them all at once.
+        
+        Takes the same filters as ``get_sales_report``. Database errors are
+        raised to the caller rather than logged and swallowed.
+        """
+        
+        if not self.db:
+            yield from self._get_fallback_report(start_date, end_date, customer_id, brand_id, status_filter)
+            return
+        
+        # Query orders with items and brand info
+        columns = '''
+            id,
+            order_number,
+            customer_id,
+            status,
+            payment_status,
+            total_amount,
+            created_at,
+            order_items(quantity, brand_name, product_id),
+            auth_accounts!orders_customer_id_fkey(full_name)
+            '''
+        if brand_id:
+            # Inner-joined alias filtered by brand, so PostgREST drops
+            # non-matching orders server-side while order_items above
+            # still carries every line for the item count.
+            columns += ', brand_items:order_items!inner(brand_name)'
+        
+        offset = 0
+        while True:
+            query = self.db.table('orders').select(columns)
             
             # Apply date filter
             query = query.gte('created_at', start_date.isoformat())
@@ -103,58 +285,54 @@ class SalesReportService:
             if status_filter:
                 query = query.eq('status', status_filter)
             
-            result = query.execute()
-            
-            if not result.data:
-                logger.info(f"No orders found for date range {start_date} to {end_date}")
-                return []
-            
-            # Map to SalesRecord
-            records = []
-            for order in result.data:
-                # Get customer name
-                customer_name = "Unknown Customer"
-                if order.get('auth_accounts'):
-                    customer_name = order['auth_accounts'].get('full_name', 'Unknown Customer')
-                
-                # Calculate total items
-                total_items = sum(item.get('quantity', 0) for item in order.get('order_items', []))
-                
-                # Check brand filter if specified (brand_id can be brand name or ID)
-                if brand_id:
-                    order_items = order.get('order_items', [])
-                    # Match against brand_name in order_items (this is the actual field available)
-                    has_brand = any(item.get('brand_name') == brand_id for item in order_items)
-                    if not has_brand:
-                        continue
-                
-                # Parse order date
-                order_date_str = order.get('created_at', '')
-                try:
-                    order_date = datetime.fromisoformat(order_date_str.replace('Z', '+00:00')).date()
-                except (ValueError, AttributeError):
-                    order_date = datetime.now().date()
-                
-                # Map payment status to method (simplified for now)
-                payment_method = self._map_payment_method(order.get('payment_status', 'unknown'))
-                
-                record = SalesRecord(
-                    order_id=order.get('order_number', order.get('id', '')),
-                    order_date=order_date,
-                    customer_name=customer_name,
-                    total_items=total_items,
-                    total_amount=float(order.get('total_amount', 0)),
-                    payment_method=payment_method,
-                    status=order.get('status', 'unknown')
-                )
-                records.append(record)
-            
-            logger.info(f"Retrieved {len(records)} sales records for date range {start_date} to {end_date}")
-            return records
+            if brand_id:
+                # Matches order_items.brand_name (the only brand field stored)
+                query = query.eq('brand_items.brand_name', brand_id)
             
-        except Exception as e:
-            logger.error(f"Error fetching sales report: {str(e)}", exc_info=True)
-            return []
+            # A stable order keeps pages from overlapping or skipping rows.
+            page = (
+                query.order('created_at')
+                .order('id')
+                .range(offset, offset + _SALES_REPORT_PAGE_SIZE - 1)
+                .execute()
+                .data
+            )
+            yield from map(self._map_order, page)
+            if len(page) < _SALES_REPORT_PAGE_SIZE:
+                return
+            offset += _SALES_REPORT_PAGE_SIZE
+    
+    def _map_order(self, order: Dict[str, Any]) -> SalesRecord:
+        """Map an orders row with its embeds to a SalesRecord."""
+        order_items = order.get('order_items', [])
+        
+        # Get customer name
+        customer_name = "Unknown Customer"
+        if order.get('auth_accounts'):
+            customer_name = order['auth_accounts'].get('full_name', 'Unknown Customer')
+        
+        # Calculate total items
+        total_items = sum(item.get('quantity', 0) for item in order_items)
+        
+        # Parse order date; the timestamp starts with YYYY-MM-DD in its own
+        # offset, so the date part is read without parsing time or zone.
+        try:
+            order_date = date.fromisoformat(order.get('created_at', '')[:10])
+        except (ValueError, TypeError):
+            order_date = date.today()
+        
+        # Map payment status to method (simplified for now)
+        payment_method = self._map_payment_method(order.get('payment_status', 'unknown'))
+        
+        return SalesRecord(
+            order_id=order.get('order_number', order.get('id', '')),
+            order_date=order_date,
+            customer_name=customer_name,
+            total_items=total_items,
+            total_amount=float(order.get('total_amount', 0)),
+            payment_method=payment_method,
+            status=order.get('status', 'unknown')
+        )
     
     def _get_fallback_report(
         self, 
@@ -165,42 +343,43 @@ class SalesReportService:
         status_filter: Optional[str] = None
     ) -> List[SalesRecord]:
         """Return fallback seed data for testing/development without database."""
-        # Seed data format: (order_id, date, customer_id, customer_name, brand_name, items, amount, method, status)
-        raw_data = [
-            ("INV-2024-0401-01", "2024-04-01", "cust_001", "Anjani Parfums", "Langit Senja", 18, 6250000.0, "transfer", "settled"),
-            ("INV-2024-0401-02", "2024-04-01", "cust_002", "Mahesa Retail", "Studio Senja", 9, 2485000.0, "virtual_account", "settled"),
-            ("INV-2024-0402-01", "2024-04-02", "cust_003", "Studio Senja", "Atar Nusantara", 12, 3840000.0, "ewallet", "settled"),
-            ("INV-2024-0403-01", "2024-04-03", "cust_001", "Rara Widyanti", "Langit Senja", 7, 1890000.0, "transfer", "pending"),
-            ("INV-2024-0404-01", "2024-04-04", "cust_004", "Atar Nusantara", "Atar Nusantara", 14, 5125000.0, "transfer", "settled"),
-            ("INV-2024-0405-01", "2024-04-05", "cust_005", "Sukma Fragrances", "Studio Senja", 6, 1575000.0, "cash_on_delivery", "settled"),
-            ("INV-2024-0406-01", "2024-04-06", "cust_001", "Aura Lestari", "Langit Senja", 11, 3350000.0, "transfer", "settled"),
+        (
+            order_ids, order_dates, _, customer_names, brands,
+            total_items, total_amounts, payment_methods, statuses,
+        ) = _FALLBACK_COLUMNS
+
+        # The date range is a contiguous slice of the sorted seed; the other
+        # filters run column by column and records are only built for matches.
+        lo = bisect_left(_FALLBACK_ORDINALS, start_date.toordinal())
+        hi = bisect_right(_FALLBACK_ORDINALS, end_date.toordinal())
+        # brand_id can be brand name or ID - match against brand name in seed data
+        if customer_id or brand_id:
+            # Start from the customer's (or brand's) own rows, narrowed to the
+            # date slice, instead of scanning every row in range.
+            if customer_id:
+                rows = _FALLBACK_BY_CUSTOMER.get(customer_id, ())
+            else:
+                rows = _FALLBACK_BY_BRAND.get(brand_id, ())
+            selected = rows[bisect_left(rows, lo):bisect_left(rows, hi)]
+        else:
+            selected = range(lo, hi)
+        if customer_id and brand_id:
+            selected = [i for i in selected if brands[i] == brand_id]
+        if status_filter:
+            selected = [i for i in selected if statuses[i] == status_filter]
+
+        return [
+            SalesRecord(
+                order_id=order_ids[i],
+                order_date=order_dates[i],
+                customer_name=customer_names[i],
+                total_items=total_items[i],
+                total_amount=total_amounts[i],
+                payment_method=payment_methods[i],
+                status=statuses[i],
+            )
+            for i in selected
         ]
-        
-        records = []
-        for order_id, order_date, cust_id, customer_name, brand, total_items, total_amount, payment_method, status in raw_data:
-            order_date_obj = datetime.strptime(order_date, "%Y-%m-%d").date()
-            
-            # Apply all filters
-            if start_date <= order_date_obj <= end_date:
-                if customer_id and cust_id != customer_id:
-                    continue
-                # brand_id can be brand name or ID - match against brand name in seed data
-                if brand_id and brand != brand_id:
-                    continue
-                if status_filter and status != status_filter:
-                    continue
-                    
-                records.append(SalesRecord(
-                    order_id=order_id,
-                    order_date=order_date_obj,
-                    customer_name=customer_name,
-                    total_items=total_items,
-                    total_amount=total_amount,
-                    payment_method=payment_method,
-                    status=status,
-                ))
-        
-        return records
     
     def _map_payment_method(self, payment_status: str) -> str:
         """Map payment status to payment method for display."""
@@ -215,34 +394,87 @@ class SalesReportService:
     def to_csv(self, records: Iterable[SalesRecord]) -> bytes:
         """Generate CSV bytes from a list of sales records."""
 
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(
+        if not isinstance(records, Sequence):
+            records = list(records)
+        body = "".join(
             [
-                "Nomor Order",
-                "Tanggal Order",
-                "Nama Pelanggan",
-                "Jumlah Item",
-                "Total (Rp)",
-                "Metode Pembayaran",
-                "Status",
+                _format_csv_row(
+                    order_id,
+                    order_date.isoformat(),
+                    customer_name,
+                    total_items,
+                    total_amount,
+                    payment_method,
+                    status,
+                )
+                for (
+                    order_id,
+                    order_date,
+                    customer_name,
+                    total_items,
+                    total_amount,
+                    payment_method,
+                    status,
+                ) in map(_ROW_GETTER, records)
             ]
         )
+        # Dates and numbers never contain delimiters, quotes or line breaks,
+        # so exact counts prove that no text field needs quoting either.
+        row_count = len(records)
+        if (
+            '"' not in body
+            and body.count(",") == 6 * row_count
+            and body.count("\n") == row_count
+            and body.count("\r") == row_count
+        ):
+            return (_CSV_HEADER + body).encode("utf-8")
+
+        parts: List[str] = [_CSV_HEADER]
+        append = parts.append
+        fallback_writer = None
+        for (
+            order_id,
+            order_date,
+            customer_name,
+            total_items,
+            total_amount,
+            payment_method,
+            status,
+        ) in map(_ROW_GETTER, records):
+            # Rows without delimiters, quotes or line breaks need no quoting,
+            # so they are formatted directly; csv.writer handles the rest.
+            if _CSV_SPECIAL.search(f"{order_id}{customer_name}{payment_method}{status}"):
+                if fallback_writer is None:
+                    buffer = StringIO()
+                    fallback_writer = csv.writer(buffer)
+                buffer.seek(0)
+                buffer.truncate()
+                fallback_writer.writerow(
+                    [
+                        order_id,
+                        order_date.isoformat(),
+                        customer_name,
+                        total_items,
+                        f"{total_amount:.2f}",
+                        payment_method,
+                        status,
+                    ]
+                )
+                append(buffer.getvalue())
+            else:
+                append(
+                    _format_csv_row(
+                        order_id,
+                        order_date.isoformat(),
+                        customer_name,
+                        total_items,
+                        total_amount,
+                        payment_method,
+                        status,
+                    )
+                )
 
-        for record in records:
-            writer.writerow(
-                [
-                    record.order_id,
-                    record.order_date.isoformat(),
-                    record.customer_name,
-                    record.total_items,
-                    f"{record.total_amount:.2f}",
-                    record.payment_method,
-                    record.status,
-                ]
-            )
-
-        return buffer.getvalue().encode("utf-8")
+        return "".join(parts).encode("utf-8")
 
     def to_xlsx(self, records: Iterable[SalesRecord]) -> bytes:
         """Generate XLSX bytes from a list of sales records without external deps."""
@@ -257,97 +489,73 @@ class SalesReportService:
             "Status",
         ]
 
-        rows = [header]
-        for record in records:
-            rows.append(
-                [
-                    record.order_id,
-                    record.order_date.isoformat(),
-                    record.customer_name,
-                    str(record.total_items),
-                    f"{record.total_amount:.2f}",
-                    record.payment_method,
-                    record.status,
-                ]
-            )
-
-        sheet_rows = []
-        for row_index, values in enumerate(rows, start=1):
-            cells = []
-            for col_index, value in enumerate(values, start=1):
-                column_letter = self._column_letter(col_index)
-                cell_reference = f"{column_letter}{row_index}"
-                escaped = escape(str(value))
-                cells.append(
-                    f"<c r=\"{cell_reference}\" t=\"inlineStr\"><is><t>{escaped}</t></is></c>"
+        # The static parts come from a prebuilt archive; only the sheet is
+        # compressed and appended per export. Rows are encoded and written to
+        # the zip entry in chunks, so the whole sheet never exists as one str.
+        stream = BytesIO(_xlsx_template())
+        with ZipFile(
+            stream,
+            mode="a",
+            compression=ZIP_DEFLATED,
+            compresslevel=self.xlsx_compresslevel,
+        ) as archive, archive.open("xl/worksheets/sheet1.xml", mode="w") as sheet:
+            parts: List[str] = [
+                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+                "<worksheet xmlns=\"http://schemas.openxmlformats.org/spreadsheetml/2006/main\">"
+                "<sheetData><row r=\"1\">"
+            ]
+            append = parts.append
+            column_letters = [self._column_letter(index) for index in range(1, len(header) + 1)]
+            (
+                order_id_col,
+                order_date_col,
+                customer_col,
+                items_col,
+                total_col,
+                payment_col,
+                status_col,
+            ) = column_letters
+            for column_letter, value in zip(column_letters, header, strict=True):
+                append(
+                    f"<c r=\"{column_letter}1\" t=\"inlineStr\"><is><t>{escape(value)}</t></is></c>"
                 )
-            sheet_rows.append(f"<row r=\"{row_index}\">{''.join(cells)}</row>")
-
-        sheet_data = "".join(sheet_rows)
-        sheet_xml = (
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-            "<worksheet xmlns=\"http://schemas.openxmlformats.org/spreadsheetml/2006/main\">"
-            f"<sheetData>{sheet_data}</sheetData>"
-            "</worksheet>"
-        )
-
-        workbook_xml = (
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-            "<workbook xmlns=\"http://schemas.openxmlformats.org/spreadsheetml/2006/main\" "
-            "xmlns:r=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships\">"
-            "<sheets><sheet name=\"Sales Report\" sheetId=\"1\" r:id=\"rId1\"/></sheets>"
-            "</workbook>"
-        )
-
-        workbook_rels = (
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-            "<Relationships xmlns=\"http://schemas.openxmlformats.org/package/2006/relationships\">"
-            "<Relationship Id=\"rId1\" Type=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet\" Target=\"worksheets/sheet1.xml\"/>"
-            "<Relationship Id=\"rId2\" Type=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles\" Target=\"styles.xml\"/>"
-            "</Relationships>"
-        )
-
-        styles_xml = (
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-            "<styleSheet xmlns=\"http://schemas.openxmlformats.org/spreadsheetml/2006/main\">"
-            "<fonts count=\"1\"><font><sz val=\"11\"/><name val=\"Calibri\"/></font></fonts>"
-            "<fills count=\"1\"><fill><patternFill patternType=\"none\"/></fill></fills>"
-            "<borders count=\"1\"><border><left/><right/><top/><bottom/><diagonal/></border></borders>"
-            "<cellStyleXfs count=\"1\"><xf numFmtId=\"0\" fontId=\"0\" fillId=\"0\" borderId=\"0\"/></cellStyleXfs>"
-            "<cellXfs count=\"1\"><xf numFmtId=\"0\" fontId=\"0\" fillId=\"0\" borderId=\"0\" xfId=\"0\"/></cellXfs>"
-            "</styleSheet>"
-        )
-
-        rels_xml = (
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-            "<Relationships xmlns=\"http://schemas.openxmlformats.org/package/2006/relationships\">"
-            "<Relationship Id=\"rId1\" Type=\"http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument\" Target=\"xl/workbook.xml\"/>"
-            "</Relationships>"
-        )
-
-        content_types_xml = (
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-            "<Types xmlns=\"http://schemas.openxmlformats.org/package/2006/content-types\">"
-            "<Default Extension=\"rels\" ContentType=\"application/vnd.openxmlformats-package.relationships+xml\"/>"
-            "<Default Extension=\"xml\" ContentType=\"application/xml\"/>"
-            "<Override PartName=\"/xl/workbook.xml\" ContentType=\"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml\"/>"
-            "<Override PartName=\"/xl/worksheets/sheet1.xml\" ContentType=\"application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml\"/>"
-            "<Override PartName=\"/xl/styles.xml\" ContentType=\"application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml\"/>"
-            "</Types>"
-        )
-
-        stream = BytesIO()
-        with ZipFile(stream, mode="w", compression=ZIP_DEFLATED) as archive:
-            archive.writestr("[Content_Types].xml", content_types_xml)
-            archive.writestr("_rels/.rels", rels_xml)
-            archive.writestr("xl/workbook.xml", workbook_xml)
-            archive.writestr("xl/_rels/workbook.xml.rels", workbook_rels)
-            archive.writestr("xl/worksheets/sheet1.xml", sheet_xml)
-            archive.writestr("xl/styles.xml", styles_xml)
+            append("</row>")
+
+            # Item counts and totals are written as numeric cells so spreadsheets
+            # can sort and sum them; the remaining columns stay inline strings.
+            # Payment methods come from a fixed mapping and statuses from the
+            # order_status enum, so only order ids and customer names are escaped.
+            for row_index, (
+                order_id,
+                order_date,
+                customer_name,
+                total_items,
+                total_amount,
+                payment_method,
+                status,
+            ) in enumerate(map(_ROW_GETTER, records), start=2):
+                append(
+                    f"<row r=\"{row_index}\">"
+                    f"<c r=\"{order_id_col}{row_index}\" t=\"inlineStr\"><is><t>{escape(str(order_id))}</t></is></c>"
+                    f"<c r=\"{order_date_col}{row_index}\" t=\"inlineStr\"><is><t>{order_date.isoformat()}</t></is></c>"
+                    f"<c r=\"{customer_col}{row_index}\" t=\"inlineStr\"><is><t>{escape(str(customer_name))}</t></is></c>"
+                    f"<c r=\"{items_col}{row_index}\"><v>{total_items:d}</v></c>"
+                    f"<c r=\"{total_col}{row_index}\"><v>{total_amount:.2f}</v></c>"
+                    f"<c r=\"{payment_col}{row_index}\" t=\"inlineStr\"><is><t>{payment_method}</t></is></c>"
+                    f"<c r=\"{status_col}{row_index}\" t=\"inlineStr\"><is><t>{status}</t></is></c>"
+                    "</row>"
+                )
+                if row_index % _XLSX_ROW_CHUNK == 0:
+                    sheet.write("".join(parts).encode("utf-8"))
+                    parts.clear()
+            append("</sheetData></worksheet>")
+            sheet.write("".join(parts).encode("utf-8"))
 
         return stream.getvalue()
 
     def _column_letter(self, index: int) -> str:
+        if index <= len(_COLUMN_LETTERS):
+            return _COLUMN_LETTERS[index - 1]
         result = ""
         while index > 0:
             index, remainder = divmod(index - 1, 26)
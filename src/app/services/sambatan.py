@@ -56,6 +56,16 @@ class ParticipationStateInvalid(SambatanError):
     status_code = 409
 
 
+# error_code values returned by join_sambatan_campaign (migration 0013).
+_JOIN_ERRORS: Dict[str, tuple[type[SambatanError], str]] = {
+    'not_found': (CampaignNotFound, "Kampanye sambatan tidak ditemukan."),
+    'closed': (CampaignClosed, "Kampanye tidak menerima partisipan baru."),
+    'deadline_passed': (CampaignClosed, "Deadline kampanye telah berakhir."),
+    'invalid_quantity': (SambatanError, "Minimal 1 slot per partisipasi."),
+    'insufficient_slots': (InsufficientSlots, "Slot sambatan tidak mencukupi."),
+}
+
+
 class SambatanStatus(str, Enum):
     """State machine for Sambatan campaigns.
     
@@ -98,8 +108,25 @@ PARTICIPANT_STATUS_TO_DB = {
 
 DB_TO_PARTICIPANT_STATUS = {v: k for k, v in PARTICIPANT_STATUS_TO_DB.items()}
 
+_fromiso = datetime.fromisoformat
+
+# Columns consumed by the row mappers; avoids pulling metadata and other
+# unused columns on every read.
+_CAMPAIGN_COLUMNS = (
+    'id, product_id, title, status, total_slots, filled_slots, slot_price, '
+    'deadline, created_at, updated_at'
+)
+_PARTICIPANT_COLUMNS = (
+    'id, campaign_id, profile_id, slot_count, status, notes, '
+    'joined_at, confirmed_at, cancelled_at'
+)
+_AUDIT_LOG_COLUMNS = 'campaign_id, event, metadata, created_at'
+
+# Upper bound on audit log rows returned per call; newest entries win.
+_AUDIT_LOG_LIMIT = 1000
+
 
-@dataclass
+@dataclass(slots=True)
 class SambatanAuditLog:
     """Structured log entry for lifecycle transitions."""
 
@@ -109,7 +136,7 @@ class SambatanAuditLog:
     metadata: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class SambatanParticipant:
     """Represents a participant in a Sambatan campaign."""
 
@@ -124,7 +151,7 @@ class SambatanParticipant:
     note: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SambatanCampaign:
     """Aggregate root storing campaign status and counters."""
 
@@ -165,10 +192,14 @@ class SambatanService:
         self._db = db
 
     def _get_db(self) -> Client:
-        """Get database client, using provided or requiring supabase."""
-        if self._db is not None:
-            return self._db
-        return require_supabase()
+        """Get database client, using provided or requiring supabase.
+
+        The shared client is resolved on first use and kept on the instance;
+        a failed lookup raises and is retried on the next call.
+        """
+        if self._db is None:
+            self._db = require_supabase()
+        return self._db
 
     # Campaign management -------------------------------------------------
     def create_campaign(
@@ -218,17 +249,19 @@ class SambatanService:
 
     def get_campaign(self, campaign_id: str) -> SambatanCampaign:
         db = self._get_db()
-        result = db.table('sambatan_campaigns').select('*').eq('id', campaign_id).execute()
+        result = db.table('sambatan_campaigns').select(_CAMPAIGN_COLUMNS).eq('id', campaign_id).maybe_single().execute()
         
-        if not result.data:
+        # maybe_single() yields no response at all (rather than empty data)
+        # on some client versions when the row is missing.
+        if result is None or not result.data:
             raise CampaignNotFound("Kampanye sambatan tidak ditemukan.")
         
-        return self._map_campaign(result.data[0])
+        return self._map_campaign(result.data)
 
     def list_campaigns(self) -> Iterable[SambatanCampaign]:
         db = self._get_db()
-        result = db.table('sambatan_campaigns').select('*').order('created_at', desc=True).execute()
-        return [self._map_campaign(row) for row in result.data]
+        result = db.table('sambatan_campaigns').select(_CAMPAIGN_COLUMNS).order('created_at', desc=True).execute()
+        return list(map(self._map_campaign, result.data))
 
     # Participation -------------------------------------------------------
     def join_campaign(
@@ -244,58 +277,28 @@ class SambatanService:
         now = _coerce_utc(now)
         db = self._get_db()
 
-        # Get campaign and validate
-        campaign = self.get_campaign(campaign_id)
-        if campaign.status not in {SambatanStatus.ACTIVE}:
-            raise CampaignClosed("Kampanye tidak menerima partisipan baru.")
-        if now > campaign.deadline:
-            raise CampaignClosed("Deadline kampanye telah berakhir.")
-        if quantity <= 0:
-            raise SambatanError("Minimal 1 slot per partisipasi.")
-        if quantity > campaign.slots_remaining():
-            raise InsufficientSlots("Slot sambatan tidak mencukupi.")
-
-        # Atomically reserve slots using database function
+        # Validation (including the slot quantity, checked after the campaign
+        # lookup), slot reservation, participant insert and audit logs all run
+        # in one transaction (migration 0013).
         try:
-            db.rpc('reserve_sambatan_slots', {
+            result = db.rpc('join_sambatan_campaign', {
                 'p_campaign_id': campaign_id,
-                'p_slot_count': quantity
+                'p_user_id': user_id,
+                'p_quantity': quantity,
+                'p_note': note,
+                'p_now': now.isoformat(),
             }).execute()
         except Exception as e:
-            if 'Insufficient slots' in str(e):
-                raise InsufficientSlots("Slot sambatan tidak mencukupi.")
-            elif 'Campaign is not active' in str(e):
-                raise CampaignClosed("Kampanye tidak menerima partisipan baru.")
             raise SambatanError(f"Gagal mereservasi slot: {str(e)}")
-        
-        # Create participant
-        participant_data = {
-            'campaign_id': campaign_id,
-            'profile_id': user_id,
-            'slot_count': quantity,
-            'contribution_amount': float(quantity * campaign.price_per_slot),
-            'status': PARTICIPANT_STATUS_TO_DB[ParticipationStatus.RESERVED],
-            'notes': note,
-            'joined_at': now.isoformat(),
-        }
-        
-        result = db.table('sambatan_participants').insert(participant_data).execute()
-        participant_row = result.data[0]
-        
-        # Check if campaign is now full
-        updated_campaign = self.get_campaign(campaign_id)
-        if updated_campaign.status == SambatanStatus.FULL:
-            self._log(campaign_id, "campaign_full", now, {"slots_taken": str(updated_campaign.slots_taken)})
-        
-        # Log participation
-        self._log(
-            campaign_id,
-            "participant_joined",
-            now,
-            {"participant_id": participant_row['id'], "quantity": str(quantity)},
-        )
+
+        outcome = result.data
+        error = _JOIN_ERRORS.get(outcome.get('error_code'))
+        if error is not None:
+            error_type, message = error
+            raise error_type(message)
 
         # Map participant with shipping address from notes
+        participant_row = outcome['participant']
         participant_row['shipping_address'] = shipping_address
         return self._map_participant(participant_row)
 
@@ -313,18 +316,20 @@ class SambatanService:
         if participant.status is not ParticipationStatus.RESERVED:
             raise ParticipationStateInvalid("Partisipasi tidak dapat dibatalkan pada status saat ini.")
 
-        campaign = self.get_campaign(participant.campaign_id)
+        # The participant row carries its campaign id, and the foreign key
+        # guarantees the campaign exists, so it is not fetched again.
+        campaign_id = participant.campaign_id
         
         # Update participant status
         db.table('sambatan_participants').update({
             'status': PARTICIPANT_STATUS_TO_DB[ParticipationStatus.CANCELLED],
             'cancelled_at': now.isoformat(),
-        }).eq('id', participation_id).execute()
+        }, returning='minimal').eq('id', participation_id).execute()
         
         # Atomically release slots using database function
         try:
             db.rpc('release_sambatan_slots', {
-                'p_campaign_id': campaign.id,
+                'p_campaign_id': campaign_id,
                 'p_slot_count': participant.quantity
             }).execute()
         except Exception as e:
@@ -332,7 +337,7 @@ class SambatanService:
         
         # Log cancellation
         self._log(
-            campaign.id,
+            campaign_id,
             "participant_cancelled",
             now,
             {"participant_id": participant.id, "reason": reason or ""},
@@ -359,7 +364,7 @@ class SambatanService:
         db.table('sambatan_participants').update({
             'status': PARTICIPANT_STATUS_TO_DB[ParticipationStatus.CONFIRMED],
             'confirmed_at': now.isoformat(),
-        }).eq('id', participation_id).execute()
+        }, returning='minimal').eq('id', participation_id).execute()
         
         self._log(
             participant.campaign_id,
@@ -373,127 +378,62 @@ class SambatanService:
         return participant
 
     def list_participants(self, campaign_id: str) -> List[SambatanParticipant]:
-        self.get_campaign(campaign_id)  # Validate campaign exists
         db = self._get_db()
         
-        result = db.table('sambatan_participants').select('*').eq('campaign_id', campaign_id).execute()
-        return [self._map_participant(row) for row in result.data]
+        result = db.table('sambatan_participants').select(_PARTICIPANT_COLUMNS).eq('campaign_id', campaign_id).execute()
+        if not result.data:
+            # Only an empty result needs telling "no participants" apart
+            # from "no such campaign".
+            self.get_campaign(campaign_id)
+        return list(map(self._map_participant, result.data))
 
     # Lifecycle -----------------------------------------------------------
     def run_lifecycle(self, *, now: Optional[datetime] = None) -> List[SambatanAuditLog]:
         now = _coerce_utc(now)
-        transitions: List[SambatanAuditLog] = []
         db = self._get_db()
 
-        # Get all active campaigns
-        result = db.table('sambatan_campaigns').select('*').in_(
-            'status',
-            [STATUS_TO_DB[SambatanStatus.ACTIVE], STATUS_TO_DB[SambatanStatus.FULL]]
-        ).execute()
-
-        for campaign_row in result.data:
-            campaign = self._map_campaign(campaign_row)
-            previous_status = campaign.status
-
-            if campaign.status is SambatanStatus.FULL:
-                self._complete_campaign(campaign, now)
-                transitions.append(SambatanAuditLog(
-                    campaign.id, 
-                    "campaign_completed", 
-                    now, 
-                    {"slots_taken": str(campaign.slots_taken)}
-                ))
-            elif now > campaign.deadline:
-                if campaign.slots_taken >= campaign.total_slots:
-                    self._complete_campaign(campaign, now)
-                    transitions.append(SambatanAuditLog(
-                        campaign.id, 
-                        "campaign_completed", 
-                        now, 
-                        {"slots_taken": str(campaign.slots_taken)}
-                    ))
-                else:
-                    self._fail_campaign(campaign, now)
-                    transitions.append(SambatanAuditLog(
-                        campaign.id, 
-                        "campaign_failed", 
-                        now, 
-                        {"slots_taken": str(campaign.slots_taken)}
-                    ))
+        # One RPC completes full or successful campaigns, fails the rest of
+        # those past their deadline, updates participants and writes the
+        # audit rows (migration 0012).
+        try:
+            result = db.rpc('run_sambatan_lifecycle', {'p_now': now.isoformat()}).execute()
+        except Exception as e:
+            raise SambatanError(f"Gagal menjalankan siklus kampanye: {str(e)}")
 
-        return transitions
+        return list(map(self._map_audit_log, result.data))
 
-    def get_audit_logs(self, campaign_id: Optional[str] = None) -> List[SambatanAuditLog]:
+    def get_audit_logs(
+        self,
+        campaign_id: Optional[str] = None,
+        *,
+        limit: int = _AUDIT_LOG_LIMIT,
+    ) -> List[SambatanAuditLog]:
         db = self._get_db()
         
-        query = db.table('sambatan_audit_logs').select('*').order('created_at', desc=True)
+        query = db.table('sambatan_audit_logs').select(_AUDIT_LOG_COLUMNS).order('created_at', desc=True)
         if campaign_id:
             query = query.eq('campaign_id', campaign_id)
         
-        result = query.execute()
-        return [self._map_audit_log(row) for row in result.data]
+        result = query.limit(limit).execute()
+        return list(map(self._map_audit_log, result.data))
 
     # Dashboard -----------------------------------------------------------
     def get_dashboard_summary(self) -> Dict[str, int]:
         db = self._get_db()
         
-        result = db.table('sambatan_campaigns').select('status, filled_slots').execute()
-        
-        campaigns = result.data
-        total_campaigns = len(campaigns)
-        active = len([c for c in campaigns if DB_TO_STATUS.get(c['status']) == SambatanStatus.ACTIVE])
-        full = len([c for c in campaigns if DB_TO_STATUS.get(c['status']) == SambatanStatus.FULL])
-        completed = len([c for c in campaigns if DB_TO_STATUS.get(c['status']) == SambatanStatus.COMPLETED])
-        failed = len([c for c in campaigns if DB_TO_STATUS.get(c['status']) == SambatanStatus.FAILED])
-        slots_taken = sum(c['filled_slots'] for c in campaigns)
-
-        return {
-            "total_campaigns": total_campaigns,
-            "active_campaigns": active,
-            "full_campaigns": full,
-            "completed_campaigns": completed,
-            "failed_campaigns": failed,
-            "total_slots_taken": slots_taken,
-        }
+        # Counts are aggregated by Postgres into a single row (migration 0014).
+        result = db.table('sambatan_dashboard_summary').select('*').single().execute()
+        return {key: int(value) for key, value in result.data.items()}
 
     # Internal helpers ----------------------------------------------------
-    def _complete_campaign(self, campaign: SambatanCampaign, now: datetime) -> None:
-        if campaign.status is SambatanStatus.COMPLETED:
-            return
-        
-        db = self._get_db()
-
-        # Use atomic database function to complete campaign
-        try:
-            db.rpc('complete_sambatan_campaign', {
-                'p_campaign_id': campaign.id
-            }).execute()
-        except Exception as e:
-            raise SambatanError(f"Gagal menyelesaikan kampanye: {str(e)}")
-        
-        self._log(campaign.id, "campaign_completed", now, {"slots_taken": str(campaign.slots_taken)})
-
-    def _fail_campaign(self, campaign: SambatanCampaign, now: datetime) -> None:
-        db = self._get_db()
-        
-        # Use atomic database function to fail campaign
-        try:
-            db.rpc('fail_sambatan_campaign', {
-                'p_campaign_id': campaign.id
-            }).execute()
-        except Exception as e:
-            raise SambatanError(f"Gagal membatalkan kampanye: {str(e)}")
-        
-        self._log(campaign.id, "campaign_failed", now, {"slots_taken": str(campaign.slots_taken)})
-
     def _get_participation(self, participation_id: str) -> SambatanParticipant:
         db = self._get_db()
-        result = db.table('sambatan_participants').select('*').eq('id', participation_id).execute()
+        result = db.table('sambatan_participants').select(_PARTICIPANT_COLUMNS).eq('id', participation_id).maybe_single().execute()
         
-        if not result.data:
+        if result is None or not result.data:
             raise ParticipationNotFound("Partisipan tidak ditemukan.")
         
-        return self._map_participant(result.data[0])
+        return self._map_participant(result.data)
 
     def _log(self, campaign_id: str, event: str, timestamp: datetime, metadata: Dict[str, str]) -> None:
         db = self._get_db()
@@ -505,7 +445,7 @@ class SambatanService:
             'created_at': timestamp.isoformat(),
         }
         
-        db.table('sambatan_audit_logs').insert(log_data).execute()
+        db.table('sambatan_audit_logs').insert(log_data, returning='minimal').execute()
 
     # Mapping helpers -----------------------------------------------------
     def _map_campaign(self, row: Dict) -> SambatanCampaign:
@@ -516,24 +456,30 @@ class SambatanService:
             title=row.get('title', ''),
             total_slots=row['total_slots'],
             price_per_slot=int(row['slot_price']),
-            deadline=datetime.fromisoformat(row['deadline']) if row.get('deadline') else datetime.now(UTC),
+            deadline=_fromiso(row['deadline']) if row.get('deadline') else datetime.now(UTC),
             status=DB_TO_STATUS.get(row['status'], SambatanStatus.INACTIVE),
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at']),
+            created_at=_fromiso(row['created_at']),
+            updated_at=_fromiso(row['updated_at']),
             slots_taken=row['filled_slots'],
             payout_released=False,
         )
 
     def _map_participant(self, row: Dict) -> SambatanParticipant:
-        """Map database row to SambatanParticipant dataclass."""
+        """Map database row to SambatanParticipant dataclass.
+
+        Rows that were never confirmed or cancelled reuse the parsed
+        joined_at instead of parsing the same string twice.
+        """
+        joined_at = _fromiso(row['joined_at'])
+        changed_at = row.get('confirmed_at') or row.get('cancelled_at')
         return SambatanParticipant(
             id=row['id'],
             campaign_id=row['campaign_id'],
             user_id=row.get('profile_id', ''),
             quantity=row['slot_count'],
             status=DB_TO_PARTICIPANT_STATUS.get(row['status'], ParticipationStatus.RESERVED),
-            joined_at=datetime.fromisoformat(row['joined_at']),
-            updated_at=datetime.fromisoformat(row.get('confirmed_at') or row.get('cancelled_at') or row['joined_at']),
+            joined_at=joined_at,
+            updated_at=_fromiso(changed_at) if changed_at else joined_at,
             shipping_address=row.get('shipping_address', row.get('notes', '')),
             note=row.get('notes'),
         )
@@ -543,7 +489,7 @@ class SambatanService:
         return SambatanAuditLog(
             campaign_id=row['campaign_id'],
             event=row['event'],
-            timestamp=datetime.fromisoformat(row['created_at']),
+            timestamp=_fromiso(row['created_at']),
             metadata=row.get('metadata', {}),
         )
 
@@ -1,10 +1,11 @@
 """Background scheduler for automated Sambatan lifecycle management."""
 
+import asyncio
 import logging
 from datetime import UTC, datetime
 from typing import Optional
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from app.services.sambatan import SambatanLifecycleService, sambatan_lifecycle_service
@@ -28,20 +29,25 @@ class SambatanScheduler:
         """
         self.lifecycle_service = lifecycle_service or sambatan_lifecycle_service
         self.interval_minutes = interval_minutes
-        self.scheduler: Optional[BackgroundScheduler] = None
+        self.scheduler: Optional[AsyncIOScheduler] = None
         self._is_running = False
 
     def start(self) -> None:
-        """Start the background scheduler."""
+        """Start the scheduler on the running event loop.
+
+        Must be called from within the application's event loop (e.g. the
+        FastAPI startup hook); ticks then run on that loop instead of a
+        dedicated scheduler thread.
+        """
         if self._is_running:
             logger.warning("Scheduler is already running")
             return
 
-        self.scheduler = BackgroundScheduler(timezone="UTC")
+        self.scheduler = AsyncIOScheduler(timezone="UTC")
         
         # Add job to run lifecycle transitions
         self.scheduler.add_job(
-            func=self._run_lifecycle_job,
+            func=self._run_lifecycle_job_async,
             trigger=IntervalTrigger(minutes=self.interval_minutes),
             id='sambatan_lifecycle',
             name='Run Sambatan lifecycle transitions',
@@ -71,6 +77,14 @@ class SambatanScheduler:
         logger.info("Manually triggering Sambatan lifecycle check")
         self._run_lifecycle_job()
 
+    async def _run_lifecycle_job_async(self) -> None:
+        """Run the lifecycle job without blocking the event loop.
+
+        The Supabase client is synchronous, so the job itself runs in the
+        default thread pool.
+        """
+        await asyncio.to_thread(self._run_lifecycle_job)
+
     def _run_lifecycle_job(self) -> None:
         """Execute the lifecycle transition job."""
         try:
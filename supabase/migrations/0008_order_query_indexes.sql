@@ -0,0 +1,11 @@
+-- Index tuning for order read paths
+-- get_order embeds order_items, order_shipping_addresses and order_status_history
+-- in a single PostgREST request. The child lookups are already index-backed by
+-- 0001 (idx_order_items_order, the order_shipping_addresses primary key and
+-- idx_order_status_history_order_created); this migration covers the remaining
+-- customer order listing, which filters by customer and sorts by recency.
+
+set search_path = public;
+
+create index if not exists idx_orders_customer_created
+    on orders (customer_id, created_at desc);
@@ -0,0 +1,46 @@
+-- Trigram-backed product search
+-- search_products previously issued `name.ilike.%q%,description.ilike.%q%`,
+-- which cannot use a btree index and scans the whole products table. The GIN
+-- trigram indexes below let Postgres answer the same ILIKE predicates from the
+-- index, and search_products() ranks matches by trigram similarity.
+
+set check_function_bodies = off;
+set search_path = public;
+
+create extension if not exists "pg_trgm" with schema public;
+
+create index if not exists idx_products_name_trgm
+    on products using gin (name gin_trgm_ops);
+create index if not exists idx_products_description_trgm
+    on products using gin (description gin_trgm_ops);
+
+CREATE OR REPLACE FUNCTION search_products(
+    p_query text,
+    p_limit integer DEFAULT 50,
+    p_marketplace_only boolean DEFAULT true
+)
+RETURNS TABLE (
+    id uuid,
+    name text,
+    slug text,
+    description text,
+    price_low numeric,
+    created_at timestamptz
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        p.id,
+        p.name,
+        p.slug,
+        p.description,
+        p.price_low,
+        p.created_at
+    FROM products p
+    WHERE (NOT p_marketplace_only OR p.marketplace_enabled)
+      AND (p.name ILIKE '%' || p_query || '%' OR p.description ILIKE '%' || p_query || '%')
+    ORDER BY greatest(similarity(p.name, p_query), similarity(coalesce(p.description, ''), p_query)) DESC,
+             p.created_at DESC
+    LIMIT p_limit;
+$$;
@@ -0,0 +1,20 @@
+-- Database-minted order numbers
+-- Order numbers used to be generated in Python from random hex before the
+-- insert. Minting them from a sequence where the row is written removes the
+-- (unlikely) collision path and lets order creation move into a single RPC.
+-- Format is unchanged: ORD-YYYYMMDD-XXXXXXXX (UTC date, uppercase hex).
+
+set search_path = public;
+
+create sequence if not exists orders_number_seq;
+
+CREATE OR REPLACE FUNCTION next_order_number()
+RETURNS text
+LANGUAGE sql
+VOLATILE
+AS $$
+    SELECT 'ORD-' || to_char(timezone('utc', now()), 'YYYYMMDD') || '-'
+        || upper(lpad(to_hex(nextval('orders_number_seq')), 8, '0'));
+$$;
+
+alter table orders alter column order_number set default next_order_number();
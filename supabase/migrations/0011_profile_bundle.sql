@@ -0,0 +1,61 @@
+-- Single round-trip profile page payload
+-- get_profile used to issue one PostgREST request each for the profile row,
+-- follow graph, perfumer products and owned brands. This function
+-- aggregates all of them server-side into one JSON document with the same
+-- shapes SupabaseProfileGateway returns for the individual calls.
+
+set check_function_bodies = off;
+set search_path = public;
+
+CREATE OR REPLACE FUNCTION get_profile_bundle(p_identifier text)
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+    WITH target AS (
+        SELECT p.*
+        FROM user_profiles p
+        WHERE p.username = p_identifier OR p.id::text = p_identifier
+        LIMIT 1
+    )
+    SELECT json_build_object(
+        'profile', to_json(t),
+        'followers', coalesce((
+            SELECT json_agg(f.follower_id)
+            FROM user_follows f
+            WHERE f.following_id = t.id
+        ), '[]'::json),
+        'following', coalesce((
+            SELECT json_agg(f.following_id)
+            FROM user_follows f
+            WHERE f.follower_id = t.id
+        ), '[]'::json),
+        'perfumer_products', coalesce((
+            SELECT json_agg(json_build_object(
+                'id', pr.id,
+                'name', pr.name,
+                'brand_name', b.name,
+                'brand_slug', b.slug,
+                'aroma_notes', pr.aroma_notes,
+                'highlight', pr.highlight_aroma
+            ))
+            FROM product_perfumers pp
+            JOIN products pr ON pr.id = pp.product_id
+            LEFT JOIN brands b ON b.id = pr.brand_id
+            WHERE pp.perfumer_profile_id = t.id
+        ), '[]'::json),
+        'owned_brands', coalesce((
+            SELECT json_agg(json_build_object(
+                'id', bs.brand_id,
+                'name', bs.name,
+                'slug', bs.slug,
+                'logo_url', bs.logo_path,
+                'status', bs.status,
+                'tagline', bs.tagline
+            ))
+            FROM profile_brand_summary bs
+            WHERE bs.profile_id = t.id
+        ), '[]'::json)
+    )
+    FROM target t;
+$$;
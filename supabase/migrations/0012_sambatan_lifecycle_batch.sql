@@ -0,0 +1,86 @@
+-- Single round-trip Sambatan lifecycle sweep
+-- run_lifecycle used to fetch the due campaigns and then call
+-- complete_sambatan_campaign / fail_sambatan_campaign once per row, followed
+-- by an audit log insert. This function applies every transition, updates
+-- the participants and writes the audit rows in one statement, returning
+-- the audit rows it inserted.
+
+set check_function_bodies = off;
+set search_path = public;
+
+CREATE OR REPLACE FUNCTION run_sambatan_lifecycle(p_now timestamptz)
+RETURNS TABLE (
+    campaign_id uuid,
+    event text,
+    metadata jsonb,
+    created_at timestamptz
+)
+LANGUAGE sql
+AS $$
+    WITH due AS (
+        SELECT
+            c.id,
+            CASE
+                WHEN c.status = 'locked' OR c.filled_slots >= c.total_slots
+                    THEN 'fulfilled'::sambatan_status
+                ELSE 'expired'::sambatan_status
+            END AS next_status
+        FROM sambatan_campaigns c
+        WHERE c.status IN ('active', 'locked')
+          AND (c.status = 'locked' OR c.deadline < p_now)
+        FOR UPDATE
+    ),
+    updated AS (
+        UPDATE sambatan_campaigns c
+        SET
+            status = d.next_status,
+            fulfilled_at = CASE
+                WHEN d.next_status = 'fulfilled' THEN timezone('utc', now())
+                ELSE c.fulfilled_at
+            END,
+            cancelled_at = CASE
+                WHEN d.next_status = 'expired' THEN timezone('utc', now())
+                ELSE c.cancelled_at
+            END
+        FROM due d
+        WHERE c.id = d.id
+        RETURNING c.id, c.status, c.filled_slots
+    ),
+    confirmed AS (
+        UPDATE sambatan_participants p
+        SET
+            status = 'confirmed',
+            confirmed_at = timezone('utc', now())
+        FROM updated u
+        WHERE p.campaign_id = u.id
+          AND u.status = 'fulfilled'
+          AND p.status = 'pending_payment'
+    ),
+    refunded AS (
+        UPDATE sambatan_participants p
+        SET status = 'refunded'
+        FROM updated u
+        WHERE p.campaign_id = u.id
+          AND u.status = 'expired'
+          AND p.status IN ('pending_payment', 'confirmed')
+    ),
+    logged AS (
+        INSERT INTO sambatan_audit_logs (campaign_id, event, metadata, created_at)
+        SELECT
+            u.id,
+            CASE WHEN u.status = 'fulfilled' THEN 'campaign_completed' ELSE 'campaign_failed' END,
+            jsonb_build_object('slots_taken', u.filled_slots::text),
+            p_now
+        FROM updated u
+        RETURNING
+            sambatan_audit_logs.campaign_id,
+            sambatan_audit_logs.event,
+            sambatan_audit_logs.metadata,
+            sambatan_audit_logs.created_at
+    )
+    SELECT l.campaign_id, l.event, l.metadata, l.created_at
+    FROM logged l;
+$$;
+
+COMMENT ON FUNCTION run_sambatan_lifecycle IS
+    'Completes or fails every due Sambatan campaign and returns the audit rows written';
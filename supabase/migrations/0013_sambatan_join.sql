@@ -0,0 +1,102 @@
+-- Single round-trip Sambatan join
+-- join_campaign used to read the campaign, call reserve_sambatan_slots,
+-- insert the participant, read the campaign again and insert audit logs:
+-- five sequential requests. join_sambatan_campaign performs the same steps
+-- in one transaction. Rule violations come back as an error_code instead of
+-- an exception so the service can map them to its own error types.
+
+set check_function_bodies = off;
+set search_path = public;
+
+CREATE OR REPLACE FUNCTION join_sambatan_campaign(
+    p_campaign_id uuid,
+    p_user_id uuid,
+    p_quantity integer,
+    p_note text,
+    p_now timestamptz
+)
+RETURNS json
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_campaign sambatan_campaigns%ROWTYPE;
+    v_participant sambatan_participants%ROWTYPE;
+BEGIN
+    SELECT * INTO v_campaign
+    FROM sambatan_campaigns
+    WHERE id = p_campaign_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN json_build_object('error_code', 'not_found');
+    END IF;
+
+    IF v_campaign.status <> 'active' THEN
+        RETURN json_build_object('error_code', 'closed');
+    END IF;
+
+    IF v_campaign.deadline IS NOT NULL AND p_now > v_campaign.deadline THEN
+        RETURN json_build_object('error_code', 'deadline_passed');
+    END IF;
+
+    IF p_quantity IS NULL OR p_quantity <= 0 THEN
+        RETURN json_build_object('error_code', 'invalid_quantity');
+    END IF;
+
+    IF v_campaign.total_slots - v_campaign.filled_slots < p_quantity THEN
+        RETURN json_build_object('error_code', 'insufficient_slots');
+    END IF;
+
+    UPDATE sambatan_campaigns
+    SET
+        filled_slots = filled_slots + p_quantity,
+        status = CASE
+            WHEN (filled_slots + p_quantity) >= total_slots THEN 'locked'
+            ELSE status
+        END,
+        progress = ROUND((filled_slots + p_quantity)::numeric / total_slots * 100, 2)
+    WHERE id = p_campaign_id
+    RETURNING * INTO v_campaign;
+
+    INSERT INTO sambatan_participants (
+        campaign_id, profile_id, slot_count, contribution_amount, status, notes, joined_at
+    )
+    VALUES (
+        p_campaign_id,
+        p_user_id,
+        p_quantity,
+        p_quantity * v_campaign.slot_price,
+        'pending_payment',
+        p_note,
+        p_now
+    )
+    RETURNING * INTO v_participant;
+
+    IF v_campaign.status = 'locked' THEN
+        INSERT INTO sambatan_audit_logs (campaign_id, event, metadata, created_at)
+        VALUES (
+            p_campaign_id,
+            'campaign_full',
+            jsonb_build_object('slots_taken', v_campaign.filled_slots::text),
+            p_now
+        );
+    END IF;
+
+    INSERT INTO sambatan_audit_logs (campaign_id, event, metadata, created_at)
+    VALUES (
+        p_campaign_id,
+        'participant_joined',
+        jsonb_build_object('participant_id', v_participant.id::text, 'quantity', p_quantity::text),
+        p_now
+    );
+
+    RETURN json_build_object(
+        'participant', to_json(v_participant),
+        'campaign_status', v_campaign.status,
+        'filled_slots', v_campaign.filled_slots
+    );
+END;
+$$;
+
+COMMENT ON FUNCTION join_sambatan_campaign IS
+    'Validates, reserves slots, adds the participant and logs the join in one transaction';
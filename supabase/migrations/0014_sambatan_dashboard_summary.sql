@@ -0,0 +1,19 @@
+-- Aggregated Sambatan dashboard counters
+-- get_dashboard_summary used to download (status, filled_slots) for every
+-- campaign and count them in Python. This view returns the same figures as
+-- a single row computed by Postgres.
+
+set search_path = public;
+
+CREATE OR REPLACE VIEW sambatan_dashboard_summary AS
+SELECT
+    count(*) AS total_campaigns,
+    count(*) FILTER (WHERE status = 'active') AS active_campaigns,
+    count(*) FILTER (WHERE status = 'locked') AS full_campaigns,
+    count(*) FILTER (WHERE status = 'fulfilled') AS completed_campaigns,
+    count(*) FILTER (WHERE status = 'expired') AS failed_campaigns,
+    coalesce(sum(filled_slots), 0) AS total_slots_taken
+FROM sambatan_campaigns;
+
+COMMENT ON VIEW sambatan_dashboard_summary IS
+    'Single-row campaign counts by status and total slots taken for the Sambatan dashboard';
@@ -51,6 +51,9 @@ class FakeSupabaseResult:
     def __init__(self, data: List[Dict[str, Any]]):
         self.data = data
 
+    def execute(self):
+        return self
+
 
 class FakeSupabaseTable:
     """Mock Supabase table interface."""
@@ -62,6 +65,8 @@ class FakeSupabaseTable:
         self._select_fields = '*'
         self._order_field: Optional[tuple[str, bool]] = None
         self._update_data: Optional[Dict[str, Any]] = None
+        self._limit: Optional[int] = None
+        self._maybe_single = False
     
     def select(self, fields: str = '*'):
         """Mock select operation."""
@@ -83,22 +88,35 @@ class FakeSupabaseTable:
         self._order_field = (field, desc)
         return self
     
-    def insert(self, data: Dict[str, Any]):
+    def limit(self, count: int):
+        """Mock row limit."""
+        self._limit = count
+        return self
+    
+    def maybe_single(self):
+        """Mock maybe_single: one row as a dict, or None when nothing matches."""
+        self._maybe_single = True
+        return self
+    
+    def insert(self, data: Dict[str, Any] | List[Dict[str, Any]], returning: str = 'representation'):
         """Mock insert operation."""
         if self.name not in self.storage:
             self.storage[self.name] = []
         
-        # Add default fields
-        row = {
-            'id': str(uuid4()),
-            'created_at': datetime.now(UTC).isoformat(),
-            'updated_at': datetime.now(UTC).isoformat(),
-            **data
-        }
-        self.storage[self.name].append(row)
-        return FakeSupabaseResult([row])
+        # Add default fields; a list of dicts is a bulk insert
+        rows = [
+            {
+                'id': str(uuid4()),
+                'created_at': datetime.now(UTC).isoformat(),
+                'updated_at': datetime.now(UTC).isoformat(),
+                **item
+            }
+            for item in (data if isinstance(data, list) else [data])
+        ]
+        self.storage[self.name].extend(rows)
+        return FakeSupabaseResult(rows)
     
-    def update(self, data: Dict[str, Any]):
+    def update(self, data: Dict[str, Any], returning: str = 'representation'):
         """Mock update operation."""
         self._update_data = data
         return self
@@ -149,10 +167,19 @@ class FakeSupabaseTable:
             field, desc = self._order_field
             results.sort(key=lambda x: x.get(field, ''), reverse=desc)
         
+        if self._limit is not None:
+            results = results[:self._limit]
+        
+        maybe_single = self._maybe_single
+        
         # Reset state
         self._filters = []
         self._order_field = None
+        self._limit = None
+        self._maybe_single = False
         
+        if maybe_single:
+            return FakeSupabaseResult(results[0] if results else None)
         return FakeSupabaseResult(results)
 
 
@@ -166,6 +193,8 @@ class FakeSupabaseClient:
             'release_sambatan_slots': self._release_slots,
             'complete_sambatan_campaign': self._complete_campaign,
             'fail_sambatan_campaign': self._fail_campaign,
+            'run_sambatan_lifecycle': self._run_lifecycle,
+            'join_sambatan_campaign': self._join_campaign,
         }
     
     def table(self, name: str):
@@ -259,6 +288,93 @@ class FakeSupabaseClient:
         
         return FakeSupabaseResult([True])
 
+    
+    def _run_lifecycle(self, params: Dict[str, Any]):
+        """Mock run_sambatan_lifecycle function."""
+        now = datetime.fromisoformat(params['p_now'])
+        
+        logs = []
+        for campaign in self.storage.get('sambatan_campaigns', []):
+            if campaign['status'] not in ['active', 'locked']:
+                continue
+            if campaign['status'] != 'locked' and datetime.fromisoformat(campaign['deadline']) >= now:
+                continue
+            
+            if campaign['status'] == 'locked' or campaign['filled_slots'] >= campaign['total_slots']:
+                self._complete_campaign({'p_campaign_id': campaign['id']})
+                event = 'campaign_completed'
+            else:
+                self._fail_campaign({'p_campaign_id': campaign['id']})
+                event = 'campaign_failed'
+            logs.append({
+                'campaign_id': campaign['id'],
+                'event': event,
+                'metadata': {'slots_taken': str(campaign['filled_slots'])},
+                'created_at': params['p_now'],
+            })
+        
+        self.storage.setdefault('sambatan_audit_logs', []).extend(logs)
+        return FakeSupabaseResult(logs)
+
+    
+    def _join_campaign(self, params: Dict[str, Any]):
+        """Mock join_sambatan_campaign function."""
+        campaign_id = params['p_campaign_id']
+        quantity = params['p_quantity']
+        
+        campaigns = self.storage.get('sambatan_campaigns', [])
+        campaign = next((c for c in campaigns if c['id'] == campaign_id), None)
+        
+        if not campaign:
+            return FakeSupabaseResult({'error_code': 'not_found'})
+        if campaign['status'] != 'active':
+            return FakeSupabaseResult({'error_code': 'closed'})
+        if campaign.get('deadline') and datetime.fromisoformat(params['p_now']) > datetime.fromisoformat(campaign['deadline']):
+            return FakeSupabaseResult({'error_code': 'deadline_passed'})
+        if quantity <= 0:
+            return FakeSupabaseResult({'error_code': 'invalid_quantity'})
+        if campaign['total_slots'] - campaign['filled_slots'] < quantity:
+            return FakeSupabaseResult({'error_code': 'insufficient_slots'})
+        
+        campaign['filled_slots'] += quantity
+        if campaign['filled_slots'] >= campaign['total_slots']:
+            campaign['status'] = 'locked'
+        
+        participant = {
+            'id': str(uuid4()),
+            'campaign_id': campaign_id,
+            'profile_id': params['p_user_id'],
+            'slot_count': quantity,
+            'contribution_amount': quantity * campaign['slot_price'],
+            'status': 'pending_payment',
+            'notes': params['p_note'],
+            'joined_at': params['p_now'],
+            'confirmed_at': None,
+            'cancelled_at': None,
+        }
+        self.storage.setdefault('sambatan_participants', []).append(participant)
+        
+        logs = self.storage.setdefault('sambatan_audit_logs', [])
+        if campaign['status'] == 'locked':
+            logs.append({
+                'campaign_id': campaign_id,
+                'event': 'campaign_full',
+                'metadata': {'slots_taken': str(campaign['filled_slots'])},
+                'created_at': params['p_now'],
+            })
+        logs.append({
+            'campaign_id': campaign_id,
+            'event': 'participant_joined',
+            'metadata': {'participant_id': participant['id'], 'quantity': str(quantity)},
+            'created_at': params['p_now'],
+        })
+        
+        return FakeSupabaseResult({
+            'participant': dict(participant),
+            'campaign_status': campaign['status'],
+            'filled_slots': campaign['filled_slots'],
+        })
+
 
 @pytest.fixture
 def fake_supabase_client() -> FakeSupabaseClient:
@@ -2,7 +2,12 @@ import asyncio
 
 import pytest
 
-from app.services.profile import ProfileError, ProfileService
+from app.services.profile import (
+    InMemoryProfileGateway,
+    ProfileError,
+    ProfileService,
+    ProfileUpdate,
+)
 from tests.conftest import FakeSupabaseProfileGateway
 
 
@@ -61,3 +66,117 @@ def test_cannot_follow_self(profile_service: ProfileService) -> None:
         asyncio.run(
             profile_service.follow_profile("user_bintang", follower_id="user_bintang")
         )
+
+
+def test_update_profile_invalidates_cached_profile(
+    profile_service: ProfileService,
+) -> None:
+    asyncio.run(profile_service.get_profile("amelia-damayanti"))
+
+    view, changed = asyncio.run(
+        profile_service.update_profile(
+            "amelia-damayanti",
+            viewer_id="user_amelia",
+            payload=ProfileUpdate(full_name="Amelia D.", bio="Bio baru"),
+        )
+    )
+
+    assert changed is True
+    assert view.profile.full_name == "Amelia D."
+    cached = asyncio.run(profile_service.get_profile("user_amelia"))
+    assert cached.profile.bio == "Bio baru"
+
+
+def test_update_profile_diffs_against_stored_profile(
+    profile_service: ProfileService,
+    fake_profile_gateway: FakeSupabaseProfileGateway,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Remote gateways return snapshots, so a cached profile can go stale.
+    fetch_profile = fake_profile_gateway.fetch_profile
+
+    async def fetch_snapshot(identifier: str):
+        profile = await fetch_profile(identifier)
+        return dict(profile) if profile is not None else None
+
+    monkeypatch.setattr(fake_profile_gateway, "fetch_profile", fetch_snapshot)
+    asyncio.run(profile_service.get_profile("amelia-damayanti"))
+    asyncio.run(fake_profile_gateway.update_profile("user_amelia", {"full_name": "Amelia D."}))
+
+    view, changed = asyncio.run(
+        profile_service.update_profile(
+            "amelia-damayanti",
+            viewer_id="user_amelia",
+            payload=ProfileUpdate(full_name="Amelia Damayanti"),
+        )
+    )
+
+    assert changed is True
+    assert fake_profile_gateway.profile_updates[-1]["user_amelia"]["full_name"] == "Amelia Damayanti"
+    assert view.profile.full_name == "Amelia Damayanti"
+
+
+def test_follow_and_unfollow_return_patched_view(
+    profile_service: ProfileService,
+) -> None:
+    followed = asyncio.run(
+        profile_service.follow_profile("chandra-pratama", follower_id="user_bintang")
+    )
+    assert followed.viewer.is_following is True
+    assert followed.stats.follower_count == 1
+    assert "user_bintang" in followed.profile.followers
+
+    unfollowed = asyncio.run(
+        profile_service.unfollow_profile("chandra-pratama", follower_id="user_bintang")
+    )
+    assert unfollowed.viewer.is_following is False
+    assert unfollowed.stats.follower_count == 0
+
+
+def test_follow_refreshes_stats(profile_service: ProfileService) -> None:
+    before = asyncio.run(profile_service.get_profile("chandra-pratama"))
+    asyncio.run(profile_service.follow_profile("chandra-pratama", follower_id="user_bintang"))
+    after = asyncio.run(profile_service.get_profile("chandra-pratama"))
+
+    assert after.stats.follower_count == before.stats.follower_count + 1
+
+
+def test_stats_match_followers_after_gateway_write(
+    profile_service: ProfileService, fake_profile_gateway: FakeSupabaseProfileGateway
+) -> None:
+    asyncio.run(profile_service.get_profile("chandra-pratama"))
+    asyncio.run(
+        fake_profile_gateway.create_follow(follower_id="user_amelia", following_id="user_chandra")
+    )
+    view = asyncio.run(profile_service.get_profile("chandra-pratama"))
+
+    assert "user_amelia" in view.profile.followers
+    assert view.stats.follower_count == len(view.profile.followers)
+
+
+class StructuralProfileGateway:
+    """Gateway that satisfies the Protocol without the optional bundle method."""
+
+    def __init__(self) -> None:
+        self._inner = InMemoryProfileGateway()
+
+    async def fetch_profile(self, identifier: str):
+        return await self._inner.fetch_profile(identifier)
+
+    async def fetch_follow_graph(self, profile_id: str):
+        return await self._inner.fetch_follow_graph(profile_id)
+
+    async def fetch_perfumer_products(self, profile_id: str):
+        return await self._inner.fetch_perfumer_products(profile_id)
+
+    async def fetch_owned_brands(self, profile_id: str):
+        return await self._inner.fetch_owned_brands(profile_id)
+
+
+def test_get_profile_without_bundle_method_uses_individual_fetches() -> None:
+    service = ProfileService(gateway=StructuralProfileGateway())  # type: ignore[arg-type]
+
+    view = asyncio.run(service.get_profile("amelia-damayanti"))
+
+    assert view.profile.full_name == "Amelia Damayanti"
+    assert view.stats.follower_count == len(view.profile.followers)
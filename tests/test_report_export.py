@@ -6,7 +6,10 @@ from zipfile import ZipFile
 from xml.etree import ElementTree as ET
 
 from app.api.routes.reports import export_sales_report
-from app.services.reporting import ExportFormat, sales_report_service
+from app.services.reporting import ExportFormat, SalesReportService
+
+# No Supabase client, so every call serves the fallback seed data.
+sales_report_service = SalesReportService()
 
 
 def test_sales_report_service_filters_by_date():
@@ -71,3 +74,20 @@ def test_export_sales_report_xlsx():
         assert first_row_cells[0].text == "INV-2024-0401-01"
 
     asyncio.run(_run())
+
+
+def test_xlsx_writes_item_counts_and_totals_as_numbers():
+    service = SalesReportService()
+    records = service.get_sales_report(start_date=date(2024, 4, 1), end_date=date(2024, 4, 1))
+
+    with ZipFile(BytesIO(service.to_xlsx(records))) as archive:
+        sheet_xml = archive.read("xl/worksheets/sheet1.xml")
+
+    root = ET.fromstring(sheet_xml)
+    namespace = {"ss": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+    first_row = root.findall("ss:sheetData/ss:row", namespace)[1]
+
+    assert [value.text for value in first_row.findall("ss:c/ss:v", namespace)] == [
+        "18",
+        "6250000.00",
+    ]
@@ -5,6 +5,7 @@ import pytest
 from app.services.products import ProductService
 from app.services.sambatan import (
     CampaignClosed,
+    CampaignNotFound,
     InsufficientSlots,
     SambatanService,
     SambatanStatus,
@@ -86,6 +87,42 @@ def test_join_campaign_updates_progress_and_status(fake_supabase_client) -> None
         )
 
 
+@pytest.mark.parametrize(
+    ("campaign_ref", "quantity", "now_offset", "error_type"),
+    [
+        ("missing", 0, timedelta(), CampaignNotFound),
+        ("existing", 1, timedelta(days=3), CampaignClosed),
+        ("existing", 0, timedelta(), SambatanError),
+        ("existing", 11, timedelta(), InsufficientSlots),
+    ],
+)
+def test_join_campaign_maps_rpc_error_codes(
+    fake_supabase_client, campaign_ref, quantity, now_offset, error_type
+) -> None:
+    product_service, sambatan_service = create_services(fake_supabase_client)
+    product_id = enable_product(product_service)
+    campaign = sambatan_service.create_campaign(
+        product_id=product_id,
+        title="Batch Validasi",
+        total_slots=10,
+        price_per_slot=200_000,
+        deadline=datetime.now(UTC) + timedelta(days=2),
+    )
+    campaign_id = campaign.id if campaign_ref == "existing" else "missing-campaign"
+
+    with pytest.raises(SambatanError) as excinfo:
+        sambatan_service.join_campaign(
+            campaign_id=campaign_id,
+            user_id="user-1",
+            quantity=quantity,
+            shipping_address="Jl. Melati No. 5",
+            now=datetime.now(UTC) + now_offset,
+        )
+
+    assert type(excinfo.value) is error_type
+    assert sambatan_service.get_campaign(campaign.id).slots_taken == 0
+
+
 def test_lifecycle_completes_and_fails_based_on_deadline(fake_supabase_client) -> None:
     product_service, sambatan_service = create_services(fake_supabase_client)
     product_id = enable_product(product_service)